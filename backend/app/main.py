@@ -5,9 +5,13 @@ Handles algorithm execution, visualization, and evaluation
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 import logging
 
+from services.metrics import REGISTRY, MetricsMiddleware, loop_lag_sampler, preload_route_templates
+from services.profiling import ProfilingMiddleware
+from services.startup import warmup
+
 # Initialize FastAPI app
 app = FastAPI(
     title="ML Algorithms Learning Platform API",
@@ -24,6 +28,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-route latency, size and status metrics, exported at /metrics
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in request profiling (PROFILE_SAMPLE_RATE / PROFILE_ADMIN_TOKEN)
+app.add_middleware(ProfilingMiddleware)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -34,13 +44,52 @@ async def health_check():
     """Check if the API is running."""
     return {"status": "healthy", "message": "ML Learning Platform API is running"}
 
+# Readiness endpoint, separate from /health so load balancers wait for warmup
+@app.get("/ready")
+async def readiness_check():
+    """Check if startup warmup has finished (503 until it has)."""
+    return JSONResponse(status_code=200 if warmup.ready else 503, content=warmup.status())
+
+# Prometheus metrics endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Export metrics in the Prometheus text format."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+@app.on_event("startup")
+async def start_loop_lag_sampler():
+    loop_lag_sampler.start()
+
+@app.on_event("shutdown")
+async def stop_loop_lag_sampler():
+    await loop_lag_sampler.stop()
+
 # Import routes
-from routes import algorithms, execution, learning_path
+from routes import algorithms, execution, learning_path, certificates, bulk
 
 # Include routers
 app.include_router(algorithms.router, prefix="/api/algorithms", tags=["algorithms"])
 app.include_router(execution.router, prefix="/api/execute", tags=["execution"])
 app.include_router(learning_path.router, prefix="/api/learning-path", tags=["learning-path"])
+app.include_router(certificates.router, prefix="/api/certificates", tags=["certificates"])
+app.include_router(bulk.router, prefix="/api/learning-path/bulk", tags=["bulk"])
+
+# Warmup steps, run in order after the routers have started (see /ready)
+from services.catalog import catalog
+from services.certificates import renderer
+
+warmup.add("catalog", catalog.reload)
+warmup.add("metrics", lambda: (preload_route_templates(app), REGISTRY.render()))
+warmup.add("execution", execution.warm_up)
+warmup.add("certificates", renderer.warm_up)
+
+@app.on_event("startup")
+async def start_warmup():
+    warmup.start()
+
+@app.on_event("shutdown")
+async def stop_warmup():
+    await warmup.stop()
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -52,5 +101,12 @@ async def global_exception_handler(request, exc):
     )
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Learning path state lives in a shared SQLite store, so workers can be scaled freely
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("API_HOST", "0.0.0.0"),
+        port=int(os.getenv("API_PORT", "8000")),
+        workers=int(os.getenv("API_WORKERS", "1"))
+    )
@@ -3,74 +3,105 @@ Algorithm Routes
 Handles fetching algorithm content and metadata
 """
 
-from fastapi import APIRouter, HTTPException
-from pathlib import Path
-import json
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import Response
+from pydantic import BaseModel
+from typing import List, Dict, Any, Optional
+
+from services.catalog import Projection, build_projection, catalog
 
 router = APIRouter()
 
-# Path to algorithm content
-CONTENT_DIR = Path(__file__).parent.parent.parent.parent / "content" / "algorithms"
+# Upper bound on algorithms in one batch content request
+MAX_BATCH_SIZE = 50
+
+class AlgorithmBatchRequest(BaseModel):
+    ids: List[str]
+    fields: Optional[List[str]] = None
+    sections: Optional[List[str]] = None
+    select: Optional[List[str]] = None
 
 def load_algorithm(algorithm_id: str) -> Dict[str, Any]:
-    """Load algorithm content from JSON file"""
-    file_path = CONTENT_DIR / f"{algorithm_id}.json"
+    """Look up algorithm content in the catalog"""
+    algorithm = catalog.get(algorithm_id)
     
-    if not file_path.exists():
+    if algorithm is None:
         raise HTTPException(status_code=404, detail=f"Algorithm '{algorithm_id}' not found")
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return algorithm
+
+def parse_projection(fields: Optional[List[str]], sections: Optional[List[str]],
+                     select: Optional[List[str]]) -> Projection:
+    """Build a projection from request parameters, rejecting malformed selectors"""
+    try:
+        return build_projection(fields, sections, select)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def json_response(content: bytes) -> Response:
+    return Response(content=content, media_type="application/json")
 
 @router.get("/list")
-async def list_algorithms():
+async def list_algorithms(
+    fields: Optional[List[str]] = Query(None),
+    sections: Optional[List[str]] = Query(None),
+    select: Optional[List[str]] = Query(None)
+):
     """
     Get list of all available algorithms with metadata
+    
+    Args:
+        fields: Top-level fields per algorithm (e.g. 'id,name'); defaults to the summary fields
+        sections: Sections to include per algorithm (e.g. 'introduction')
+        select: JSON pointers to include (e.g. '/sections/introduction/learningType')
+    
     Returns: List of algorithm summaries
     """
-    algorithms = []
-    
-    # Scan content directory for algorithm files
-    if not CONTENT_DIR.exists():
-        return {"algorithms": [], "count": 0}
-    
-    for file_path in CONTENT_DIR.glob("*.json"):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Extract summary info
-                algorithms.append({
-                    "id": data.get("id"),
-                    "name": data.get("name"),
-                    "category": data.get("category"),
-                    "difficulty": data.get("difficulty"),
-                    "estimatedTime": data.get("estimatedTime")
-                })
-        except Exception as e:
-            print(f"Error loading {file_path}: {e}")
-            continue
-    
-    # Sort by category and difficulty
-    algorithms.sort(key=lambda x: (x["category"], x["difficulty"]))
+    projection = parse_projection(fields, sections, select)
+    return json_response(catalog.listing(projection))
+
+@router.post("/batch")
+async def get_algorithms_batch(batch_request: AlgorithmBatchRequest):
+    """
+    Get several algorithms in one request, with the same projection options as the detail route
     
-    return {
-        "algorithms": algorithms,
-        "count": len(algorithms)
-    }
+    Returns:
+        The projected documents in request order, plus IDs that were not found
+    """
+    if not batch_request.ids:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one algorithm ID")
+    if len(batch_request.ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(batch_request.ids)} algorithms (max {MAX_BATCH_SIZE})"
+        )
+    projection = parse_projection(batch_request.fields, batch_request.sections, batch_request.select)
+    return json_response(catalog.batch(batch_request.ids, projection))
 
 @router.get("/{algorithm_id}")
-async def get_algorithm(algorithm_id: str):
+async def get_algorithm(
+    algorithm_id: str,
+    fields: Optional[List[str]] = Query(None),
+    sections: Optional[List[str]] = Query(None),
+    select: Optional[List[str]] = Query(None)
+):
     """
-    Get complete algorithm content
+    Get algorithm content, whole or projected
     
     Args:
         algorithm_id: Unique identifier for the algorithm (e.g., 'linear_regression')
+        fields: Top-level fields to include (e.g. 'id,name,difficulty')
+        sections: Sections to include (e.g. 'introduction,mathematical_model')
+        select: JSON pointers to include (e.g. '/sections/mathematical_model/equations')
     
     Returns:
-        Complete algorithm content with all sections
+        Complete algorithm content with all sections, or only the selected parts
     """
-    return load_algorithm(algorithm_id)
+    projection = parse_projection(fields, sections, select)
+    content = catalog.projected(algorithm_id, projection)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Algorithm '{algorithm_id}' not found")
+    return json_response(content)
 
 @router.get("/{algorithm_id}/section/{section_name}")
 async def get_algorithm_section(algorithm_id: str, section_name: str):
@@ -141,18 +172,7 @@ async def list_categories():
     Returns:
         List of unique categories with algorithm counts
     """
-    algorithms = []
-    
-    if not CONTENT_DIR.exists():
-        return {"categories": []}
-    
-    for file_path in CONTENT_DIR.glob("*.json"):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                algorithms.append(data)
-        except Exception:
-            continue
+    algorithms = catalog.documents()
     
     # Group by category
     categories = {}
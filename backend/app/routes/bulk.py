@@ -0,0 +1,90 @@
+"""
+Bulk Data API Routes
+Streams learning path records out as NDJSON and back in with batched,
+resumable writes
+"""
+
+from fastapi import APIRouter, HTTPException, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from datetime import datetime
+import hmac
+import os
+
+from services.bulk import IMPORT_BATCH_SIZE, ImportSession
+from services.store import EXPORT_QUERIES, parse_cursor, store
+from services.params import split_values
+
+router = APIRouter()
+
+# Bulk requests must carry it in the X-Admin-Token header; unset disables the bulk API
+ADMIN_TOKEN = os.getenv("BULK_ADMIN_TOKEN", "")
+
+# Upper bound on records written per import transaction
+MAX_IMPORT_BATCH_SIZE = 5000
+
+
+def check_admin(token: Optional[str]):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=503, detail="Bulk data access is disabled: BULK_ADMIN_TOKEN is not set")
+    if not hmac.compare_digest((token or "").encode(), ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Bulk data access requires a valid X-Admin-Token header")
+
+
+@router.get("/export")
+async def export_records(
+    types: Optional[List[str]] = Query(None),
+    after: Optional[str] = None,
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Stream all learning path records as NDJSON
+    A cursor line follows each page; pass its value as 'after' to resume
+    """
+    check_admin(x_admin_token)
+    kinds = split_values(types) or None
+    unknown = [kind for kind in kinds or [] if kind not in EXPORT_QUERIES]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown record types {unknown}; expected any of {list(EXPORT_QUERIES)}"
+        )
+    if after:
+        try:
+            parse_cursor(after)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"learning-path-{datetime.now().strftime('%Y%m%dT%H%M%S')}.ndjson"
+    return StreamingResponse(
+        store.export_ndjson(kinds, after),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.post("/import")
+async def import_records(
+    request: Request,
+    importId: Optional[str] = None,
+    batchSize: int = Query(IMPORT_BATCH_SIZE, ge=1, le=MAX_IMPORT_BATCH_SIZE),
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    Import an NDJSON export streamed in the request body
+    With an importId, a retried import skips the lines already committed
+    """
+    check_admin(x_admin_token)
+    try:
+        session = await run_in_threadpool(ImportSession, importId, batchSize)
+        async for chunk in request.stream():
+            if chunk:
+                await run_in_threadpool(session.feed, chunk)
+        summary = await run_in_threadpool(session.finish)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to import records: {str(e)}")
+
+    return {"success": True, **summary}
@@ -0,0 +1,130 @@
+"""
+Certificate Download Routes
+Streams rendered certificate files with range and ETag support
+"""
+
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+import asyncio
+import os
+import re
+
+from services.certificates import FORMATS, renderer
+from services.metrics import record_cache
+from services.store import store
+
+router = APIRouter()
+
+# Chunk size for streaming artifacts
+CHUNK_SIZE = 64 * 1024
+
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: str, size: int):
+    """
+    Parse a single-range 'Range' header
+    Returns (start, end) inclusive, or None if the range is unsatisfiable
+    """
+    match = RANGE_PATTERN.match(header.strip())
+    if not match or match.groups() == ("", ""):
+        return None
+    start, end = match.groups()
+    if start == "":
+        # Suffix range: last N bytes
+        length = int(end)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = int(end) if end else size - 1
+    if start >= size or end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def iter_file(path: str, start: int, length: int):
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = length
+        while remaining > 0:
+            chunk = f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+@router.get("/download/{cert_id}")
+def download_certificate(cert_id: str, request: Request, format: str = "pdf"):
+    """
+    Download a rendered certificate
+
+    Args:
+        cert_id: Certificate ID returned by /api/learning-path/certificates/generate
+        format: 'pdf' or 'png'
+
+    Returns:
+        The file, 206 for range requests, 304 if the ETag matches,
+        or 202 while the certificate is still rendering
+    """
+    if format not in FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid format: {format}. Must be one of {sorted(FORMATS)}"
+        )
+
+    certificate = store.get_certificate(cert_id)
+    if certificate is None:
+        raise HTTPException(status_code=404, detail=f"Certificate '{cert_id}' not found")
+
+    status, path, key = renderer.artifact(certificate, format)
+    record_cache("certificate_artifacts", hits=int(status == "ready"), misses=int(status != "ready"))
+    if status == "failed":
+        raise HTTPException(status_code=500, detail=f"Failed to render certificate '{cert_id}'")
+    if status == "pending":
+        return JSONResponse(
+            status_code=202,
+            content={"success": False, "status": "rendering", "certificateId": cert_id},
+            headers={"Retry-After": "1"}
+        )
+
+    etag = f'"{key}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # Artifacts are content-addressed, so a given ETag never changes
+        "Cache-Control": "public, max-age=31536000, immutable",
+        "Content-Disposition": f'attachment; filename="{cert_id}.{format}"',
+    }
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    size = os.path.getsize(path)
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        byte_range = parse_range(range_header, size)
+        if byte_range is None:
+            return Response(status_code=416, headers={"Content-Range": f"bytes */{size}", **headers})
+        start, end = byte_range
+        length = end - start + 1
+        headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(length)
+        return StreamingResponse(
+            iter_file(path, start, length),
+            status_code=206,
+            media_type=FORMATS[format],
+            headers=headers
+        )
+
+    headers["Content-Length"] = str(size)
+    return StreamingResponse(iter_file(path, 0, size), media_type=FORMATS[format], headers=headers)
+
+
+@router.on_event("shutdown")
+async def shutdown_renderer():
+    """Stop the background render workers"""
+    await asyncio.to_thread(renderer.shutdown)
@@ -9,9 +9,10 @@ from typing import Dict, Any, List, Optional
 import sys
 from io import StringIO
 import traceback
-import numpy as np
 import json
 
+from services.metrics import execution_in_progress, track_in_progress
+
 router = APIRouter()
 
 class CodeExecutionRequest(BaseModel):
@@ -24,6 +25,7 @@ class EvaluationRequest(BaseModel):
     task_type: str  # 'regression' or 'classification'
 
 @router.post("/run")
+@track_in_progress(execution_in_progress, "run")
 async def execute_code(request: CodeExecutionRequest):
     """
     Execute Python code in a sandboxed environment
@@ -51,6 +53,8 @@ async def execute_code(request: CodeExecutionRequest):
     }
     
     try:
+        import numpy as np
+
         # Create restricted namespace
         namespace = {
             '__builtins__': __builtins__,
@@ -83,6 +87,7 @@ async def execute_code(request: CodeExecutionRequest):
     return result
 
 @router.post("/evaluate")
+@track_in_progress(execution_in_progress, "evaluate")
 async def evaluate_model(request: EvaluationRequest):
     """
     Evaluate model performance with appropriate metrics
@@ -93,6 +98,13 @@ async def evaluate_model(request: EvaluationRequest):
     Returns:
         Dictionary of evaluation metrics
     """
+    return compute_evaluation(request)
+
+def compute_evaluation(request: EvaluationRequest) -> Dict[str, Any]:
+    """Metrics and their interpretation for one evaluation request"""
+    # NumPy and scikit-learn are imported on first use (or by warm_up) to keep app import fast
+    import numpy as np
+
     y_true = np.array(request.y_true)
     y_pred = np.array(request.y_pred)
     
@@ -210,6 +222,7 @@ async def generate_visualization(data: Dict[str, Any]):
         }
     
     elif viz_type == "confusion_matrix":
+        import numpy as np
         cm = np.array(data.get("matrix", [[0]]))
         return {
             "type": "heatmap",
@@ -230,3 +243,8 @@ async def generate_visualization(data: Dict[str, Any]):
             status_code=400,
             detail=f"Unsupported visualization type: {viz_type}"
         )
+
+def warm_up():
+    """Run one evaluation of each task type so NumPy and scikit-learn are loaded before the first request"""
+    for task_type in ("regression", "classification"):
+        compute_evaluation(EvaluationRequest(y_true=[0, 1, 1, 0], y_pred=[0, 1, 0, 0], task_type=task_type))
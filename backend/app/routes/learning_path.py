@@ -4,24 +4,28 @@ Handles progress tracking, achievements, challenges, and certificates
 Requirements: 13.2, 13.3, 8.2, 15.1, 7.1, 7.2
 """
 
-from fastapi import APIRouter, HTTPException, Depends
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Depends, WebSocket
+from pydantic import BaseModel, Field, ValidationError
+from starlette.concurrency import run_in_threadpool
 from typing import Dict, List, Optional, Any
-from datetime import datetime
+from datetime import datetime, timezone
+import asyncio
 import json
-import os
+import logging
+
+from services.analytics import RETENTION_DAYS
+from services.challenge_bank import challenge_bank
+from services.certificates import renderer
+from services.realtime import Connection, hub
+from services.recommendations import recommendations
+from services.store import store, utc_timestamp
 
 router = APIRouter()
 
-# In-memory storage (replace with database in production)
-progress_store: Dict[str, Any] = {}
-achievements_store: Dict[str, List[Any]] = {}
-certificates_store: Dict[str, List[Any]] = {}
-challenges_store: Dict[str, List[Any]] = {}
+logger = logging.getLogger(__name__)
 
-# Data directory for persistence
-DATA_DIR = os.path.join(os.path.dirname(__file__), '..', 'data')
-os.makedirs(DATA_DIR, exist_ok=True)
+# Upper bound on items accepted by a single batch request
+MAX_BATCH_SIZE = 500
 
 # Pydantic models
 class ProgressData(BaseModel):
@@ -55,40 +59,135 @@ class CertificateGenerateRequest(BaseModel):
     studentName: str
     completionDate: datetime = Field(default_factory=datetime.now)
 
+class AchievementBatchAwardRequest(BaseModel):
+    awards: List[AchievementAwardRequest]
 
-# Helper functions
-def load_progress_from_file(student_id: str) -> Optional[Dict]:
-    """Load progress from file"""
-    file_path = os.path.join(DATA_DIR, f'progress_{student_id}.json')
-    if os.path.exists(file_path):
-        try:
-            with open(file_path, 'r') as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading progress: {e}")
-    return None
+class ChallengeBatchSubmission(BaseModel):
+    submissions: List[ChallengeSubmission]
 
-def save_progress_to_file(student_id: str, data: Dict):
-    """Save progress to file"""
-    file_path = os.path.join(DATA_DIR, f'progress_{student_id}.json')
-    try:
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
-    except Exception as e:
-        print(f"Error saving progress: {e}")
+class StudentBatchRequest(BaseModel):
+    studentIds: List[str]
+    include: List[str] = ["progress", "achievements", "certificates"]
+
+
+# Helper functions
+def empty_progress(student_id: str) -> Dict:
+    """Build the default progress record for a student with no saved data"""
+    return {
+        "studentId": student_id,
+        "algorithmProgress": {},
+        "completedSteps": {},
+        "onboardingComplete": False,
+        "lastSyncDate": datetime.now().isoformat()
+    }
+
+def check_batch_size(items: List[Any]):
+    """Reject empty or oversized batch requests"""
+    if not items:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one item")
+    if len(items) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch too large: {len(items)} items (max {MAX_BATCH_SIZE})"
+        )
+
+def publish_progress(student_id: str, source: Optional[Connection] = None):
+    """Push a student's stored progress and fresh recommendations to their open channels"""
+    if not hub.listening(student_id):
+        return
+    progress = store.load_progress(student_id)
+    hub.publish(student_id, {
+        "type": "progress",
+        "data": progress,
+        "recommendations": recommendations.recommend(student_id, progress)
+    }, source)
+
+def record_achievements(awards: List[AchievementAwardRequest], source: Optional[Connection] = None) -> List[Dict]:
+    """Store achievement awards in one batch, skipping ones the student already has"""
+    new = store.award_achievements([
+        {
+            "studentId": award.studentId,
+            "achievementId": award.achievementId,
+            "earnedDate": award.earnedDate.isoformat()
+        }
+        for award in awards
+    ])
+    
+    results = []
+    for award, awarded in zip(awards, new):
+        if not awarded:
+            results.append({
+                "success": False,
+                "message": "Achievement already awarded"
+            })
+            continue
+        achievement = {
+            "achievementId": award.achievementId,
+            "earnedDate": award.earnedDate.isoformat()
+        }
+        results.append({
+            "success": True,
+            "message": "Achievement awarded successfully",
+            "achievement": achievement
+        })
+        if hub.listening(award.studentId):
+            hub.publish(award.studentId, {"type": "achievement", "achievement": achievement}, source)
+    return results
+
+def record_challenge_submissions(submissions: List[ChallengeSubmission],
+                                 source: Optional[Connection] = None) -> List[Optional[Dict]]:
+    """
+    Grade challenge submissions against the challenge bank and store them in one batch
+    Entries are None for challenges that are not in the bank
+    """
+    results = []
+    graded = []
+    for submission in submissions:
+        result = challenge_bank.grade(submission.algorithmId, submission.challengeId, submission.selectedAnswer)
+        results.append(result)
+        if result is not None:
+            submission_data = submission.dict()
+            submission_data.update(correct=result["correct"], score=result["score"])
+            graded.append(submission_data)
+    
+    if graded:
+        store.record_submissions(graded)
+    for submission, result in zip(submissions, results):
+        if result is not None and hub.listening(submission.studentId):
+            hub.publish(submission.studentId, {
+                "type": "challenge",
+                "algorithmId": submission.algorithmId,
+                "challengeId": submission.challengeId,
+                "result": result
+            }, source)
+    return results
+
+
+@router.on_event("startup")
+async def startup_learning_path():
+    """Open the shared store, load the challenge bank and compile the prerequisite graph once per process"""
+    store.initialize()
+    challenge_bank.maybe_reload()
+    recommendations.load()
+    hub.start()
+
+
+@router.on_event("shutdown")
+async def shutdown_learning_path():
+    """Stop relaying realtime events"""
+    await hub.stop()
 
 
 # Progress endpoints
 @router.post("/progress/save")
-async def save_progress(progress: ProgressData):
+def save_progress(progress: ProgressData):
     """
     Save student progress data
     Requirements: 13.2, 13.3
     """
     try:
-        progress_data = progress.dict()
-        progress_store[progress.studentId] = progress_data
-        save_progress_to_file(progress.studentId, progress_data)
+        store.save_progress(progress.studentId, progress.dict())
+        publish_progress(progress.studentId)
         
         return {
             "success": True,
@@ -100,81 +199,46 @@ async def save_progress(progress: ProgressData):
 
 
 @router.get("/progress/load/{student_id}")
-async def load_progress(student_id: str):
+def load_progress(student_id: str):
     """
     Load student progress data
     Requirements: 13.2, 13.3
     """
     try:
-        # Try memory first
-        if student_id in progress_store:
-            return {
-                "success": True,
-                "data": progress_store[student_id]
-            }
-        
-        # Try file storage
-        file_data = load_progress_from_file(student_id)
-        if file_data:
-            progress_store[student_id] = file_data
+        data = store.load_progress(student_id)
+        if data:
             return {
                 "success": True,
-                "data": file_data
+                "data": data
             }
         
         # Return empty progress
         return {
             "success": True,
-            "data": {
-                "studentId": student_id,
-                "algorithmProgress": {},
-                "completedSteps": {},
-                "onboardingComplete": False,
-                "lastSyncDate": datetime.now().isoformat()
-            }
+            "data": empty_progress(student_id)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to load progress: {str(e)}")
 
 
 @router.post("/progress/sync")
-async def sync_progress(sync_request: ProgressSyncRequest):
+def sync_progress(sync_request: ProgressSyncRequest):
     """
     Sync progress updates with conflict resolution
     Requirements: 13.3, 13.5
     """
     try:
-        student_id = sync_request.studentId
-        
-        # Get existing progress
-        existing = progress_store.get(student_id) or load_progress_from_file(student_id)
-        
-        if not existing:
-            # No existing data, save new
-            progress_store[student_id] = {
-                "studentId": student_id,
-                "algorithmProgress": sync_request.updates,
-                "lastSyncDate": sync_request.timestamp.isoformat()
+        # Merge updates (last write wins for conflicts)
+        newer = store.sync_progress(sync_request.studentId, sync_request.updates, sync_request.timestamp)
+        if newer is not None:
+            # Existing is newer, return conflict
+            return {
+                "success": False,
+                "conflict": True,
+                "message": "Server has newer data",
+                "serverData": newer
             }
-        else:
-            # Merge updates (last write wins for conflicts)
-            existing_timestamp = datetime.fromisoformat(existing.get("lastSyncDate", "2000-01-01T00:00:00"))
-            
-            if sync_request.timestamp > existing_timestamp:
-                # Update is newer, merge it
-                existing["algorithmProgress"].update(sync_request.updates)
-                existing["lastSyncDate"] = sync_request.timestamp.isoformat()
-                progress_store[student_id] = existing
-            else:
-                # Existing is newer, return conflict
-                return {
-                    "success": False,
-                    "conflict": True,
-                    "message": "Server has newer data",
-                    "serverData": existing
-                }
-        
-        save_progress_to_file(student_id, progress_store[student_id])
+        publish_progress(sync_request.studentId)
         
         return {
             "success": True,
@@ -187,13 +251,13 @@ async def sync_progress(sync_request: ProgressSyncRequest):
 
 # Achievement endpoints
 @router.get("/achievements/{student_id}")
-async def get_achievements(student_id: str):
+def get_achievements(student_id: str):
     """
     Get all achievements for a student
     Requirements: 8.2
     """
     try:
-        achievements = achievements_store.get(student_id, [])
+        achievements = store.get_achievements(student_id)
         return {
             "success": True,
             "achievements": achievements
@@ -203,48 +267,53 @@ async def get_achievements(student_id: str):
 
 
 @router.post("/achievements/award")
-async def award_achievement(award: AchievementAwardRequest):
+def award_achievement(award: AchievementAwardRequest):
     """
     Award an achievement to a student
     Requirements: 8.2
     """
     try:
-        if award.studentId not in achievements_store:
-            achievements_store[award.studentId] = []
-        
-        # Check if already awarded
-        existing = next((a for a in achievements_store[award.studentId] if a["achievementId"] == award.achievementId), None)
-        if existing:
-            return {
-                "success": False,
-                "message": "Achievement already awarded"
+        return record_achievements([award])[0]
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to award achievement: {str(e)}")
+
+
+@router.post("/achievements/award/batch")
+def award_achievements_batch(batch: AchievementBatchAwardRequest):
+    """
+    Award many achievements in one request
+    Each award gets its own status entry in the response
+    Requirements: 8.2
+    """
+    check_batch_size(batch.awards)
+    try:
+        results = [
+            {
+                "studentId": award.studentId,
+                "achievementId": award.achievementId,
+                **result
             }
-        
-        achievement_data = {
-            "achievementId": award.achievementId,
-            "earnedDate": award.earnedDate.isoformat()
-        }
-        
-        achievements_store[award.studentId].append(achievement_data)
+            for award, result in zip(batch.awards, record_achievements(batch.awards))
+        ]
         
         return {
             "success": True,
-            "message": "Achievement awarded successfully",
-            "achievement": achievement_data
+            "awarded": sum(1 for r in results if r["success"]),
+            "results": results
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to award achievement: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to award achievements: {str(e)}")
 
 
 # Certificate endpoints
 @router.get("/certificates/{student_id}")
-async def get_certificates(student_id: str):
+def get_certificates(student_id: str):
     """
     Get earned certificates for a student
     Requirements: 15.1
     """
     try:
-        certificates = certificates_store.get(student_id, [])
+        certificates = store.get_certificates(student_id)
         return {
             "success": True,
             "certificates": certificates
@@ -254,15 +323,12 @@ async def get_certificates(student_id: str):
 
 
 @router.post("/certificates/generate")
-async def generate_certificate(cert_request: CertificateGenerateRequest):
+def generate_certificate(cert_request: CertificateGenerateRequest):
     """
     Generate a certificate for a student
     Requirements: 15.1
     """
     try:
-        if cert_request.studentId not in certificates_store:
-            certificates_store[cert_request.studentId] = []
-        
         # Generate unique certificate ID
         cert_id = f"CERT-{cert_request.certificateType.upper()}-{cert_request.studentId}-{int(datetime.now().timestamp())}"
         
@@ -275,82 +341,109 @@ async def generate_certificate(cert_request: CertificateGenerateRequest):
             "shareUrl": f"/certificates/{cert_id}"
         }
         
-        certificates_store[cert_request.studentId].append(certificate_data)
-        
-        return {
-            "success": True,
-            "message": "Certificate generated successfully",
-            "certificate": certificate_data
-        }
+        store.add_certificate(cert_request.studentId, certificate_data)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate certificate: {str(e)}")
 
+    # Render PDF/PNG in the background; the download URL serves them once ready.
+    # The certificate is stored by now, and downloads queue the render again if this fails
+    try:
+        renderer.register(certificate_data)
+    except Exception as e:
+        logger.error(f"Failed to schedule rendering of certificate {cert_id}: {e}")
+
+    return {
+        "success": True,
+        "message": "Certificate generated successfully",
+        "certificate": certificate_data
+    }
+
 
 # Challenge endpoints
 @router.get("/challenges/{algorithm_id}")
-async def get_challenge(algorithm_id: str):
+def get_challenge(algorithm_id: str, studentId: Optional[str] = None):
     """
     Get challenge for an algorithm
+    With a studentId, picks at random without repeating until all are seen
     Requirements: 7.1
     """
+    if studentId:
+        challenge = store.serve_challenge(
+            studentId, algorithm_id, lambda served: challenge_bank.pick(algorithm_id, served)
+        )
+    else:
+        challenge, _ = challenge_bank.pick(algorithm_id)
+    if challenge is None:
+        raise HTTPException(status_code=404, detail=f"No challenges found for algorithm '{algorithm_id}'")
+    
+    return {
+        "success": True,
+        "challenge": challenge_bank.public_view(challenge)
+    }
+
+
+@router.post("/challenges/submit")
+def submit_challenge(submission: ChallengeSubmission):
+    """
+    Submit a challenge response
+    Requirements: 7.2
+    """
+    if challenge_bank.get(submission.algorithmId, submission.challengeId) is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Challenge '{submission.challengeId}' not found for algorithm '{submission.algorithmId}'"
+        )
+    
     try:
-        # In production, load from database
-        # For now, return a sample challenge structure
+        result = record_challenge_submissions([submission])[0]
         return {
             "success": True,
-            "challenge": {
-                "id": f"challenge_{algorithm_id}",
-                "algorithmId": algorithm_id,
-                "question": "Sample challenge question",
-                "options": ["Option A", "Option B", "Option C", "Option D"],
-                "correctAnswer": "Option A",
-                "hint": "Think about the core concept",
-                "explanation": "Detailed explanation here"
-            }
+            "message": "Challenge submission recorded",
+            "result": result
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get challenge: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to submit challenge: {str(e)}")
 
 
-@router.post("/challenges/submit")
-async def submit_challenge(submission: ChallengeSubmission):
+@router.post("/challenges/submit/batch")
+def submit_challenges_batch(batch: ChallengeBatchSubmission):
     """
-    Submit a challenge response
+    Submit many challenge responses in one request
+    Each submission gets its own status entry in the response
     Requirements: 7.2
     """
+    check_batch_size(batch.submissions)
     try:
-        if submission.studentId not in challenges_store:
-            challenges_store[submission.studentId] = []
-        
-        # Store submission
-        submission_data = submission.dict()
-        challenges_store[submission.studentId].append(submission_data)
+        results = []
+        for submission, result in zip(batch.submissions, record_challenge_submissions(batch.submissions)):
+            entry = {
+                "studentId": submission.studentId,
+                "challengeId": submission.challengeId,
+                "success": result is not None
+            }
+            if result is None:
+                entry["message"] = f"Challenge not found for algorithm '{submission.algorithmId}'"
+            else:
+                entry["result"] = result
+            results.append(entry)
         
-        # In production, validate answer against database
-        # For now, return success
         return {
             "success": True,
-            "message": "Challenge submission recorded",
-            "result": {
-                "correct": True,  # Would validate in production
-                "score": 100,
-                "feedback": "Great job!",
-                "explanation": "Your answer is correct"
-            }
+            "recorded": sum(1 for r in results if r["success"]),
+            "results": results
         }
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to submit challenge: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to submit challenges: {str(e)}")
 
 
 @router.get("/challenges/history/{student_id}/{algorithm_id}")
-async def get_challenge_history(student_id: str, algorithm_id: str):
+def get_challenge_history(student_id: str, algorithm_id: str):
     """
     Get challenge attempt history for an algorithm
     Requirements: 7.2
     """
     try:
-        all_submissions = challenges_store.get(student_id, [])
-        algorithm_submissions = [s for s in all_submissions if s.get("algorithmId") == algorithm_id]
+        algorithm_submissions = store.challenge_history(student_id, algorithm_id)
         
         return {
             "success": True,
@@ -358,3 +451,237 @@ async def get_challenge_history(student_id: str, algorithm_id: str):
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get challenge history: {str(e)}")
+
+
+# Recommendation endpoints
+@router.get("/recommendations/{student_id}")
+def get_recommendations(student_id: str):
+    """
+    Next step, suggested algorithms, unlocks and performance scores for a student
+    Recomputed only when the student's progress has changed
+    """
+    try:
+        progress = store.load_progress(student_id)
+        return {
+            "success": True,
+            "studentId": student_id,
+            "recommendations": recommendations.recommend(student_id, progress)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get recommendations: {str(e)}")
+
+
+# Realtime channel
+def channel_error(error: Exception) -> str:
+    if not isinstance(error, ValidationError):
+        return str(error)
+    first = error.errors()[0]
+    return f"{'.'.join(str(part) for part in first['loc'])}: {first['msg']}"
+
+def channel_hello(student_id: str) -> Dict[str, Any]:
+    """Initial state, replacing the separate load and achievement requests"""
+    progress = store.load_progress(student_id)
+    return {
+        "type": "hello",
+        "studentId": student_id,
+        "progress": progress or empty_progress(student_id),
+        "achievements": store.get_achievements(student_id),
+        "recommendations": recommendations.recommend(student_id, progress)
+    }
+
+def handle_channel_batch(student_id: str, frames: List[str], connection: Connection) -> Dict[str, Any]:
+    """
+    Apply a batch of client messages and build the single ack that answers them
+    Progress deltas in a batch are merged into one sync, and achievements and
+    challenge submissions are each stored in one transaction
+    """
+    acks: List[Dict[str, Any]] = []
+    reply: Dict[str, Any] = {"type": "ack", "acks": acks}
+    progress_acks: List[Dict[str, Any]] = []
+    updates: Dict[str, Any] = {}
+    progress_times: List[datetime] = []
+    awards: List[AchievementAwardRequest] = []
+    award_acks: List[Dict[str, Any]] = []
+    submissions: List[ChallengeSubmission] = []
+    submission_acks: List[Dict[str, Any]] = []
+
+    for frame in frames:
+        try:
+            message = json.loads(frame)
+            if not isinstance(message, dict):
+                raise ValueError("expected a JSON object")
+        except ValueError as e:
+            acks.append({"seq": None, "success": False, "message": f"Invalid message: {str(e)}"})
+            continue
+
+        kind = message.get("type")
+        ack = {"seq": message.get("seq"), "type": kind}
+        acks.append(ack)
+        if message.get("studentId", student_id) != student_id:
+            ack.update(success=False, message="studentId does not match the channel")
+            continue
+        fields = {k: v for k, v in message.items() if k not in ("type", "seq", "studentId")}
+        try:
+            if kind == "progress":
+                sync = ProgressSyncRequest(studentId=student_id, **{"timestamp": datetime.now(timezone.utc), **fields})
+                updates.update(sync.updates)
+                progress_times.append(utc_timestamp(sync.timestamp))
+                progress_acks.append(ack)
+            elif kind == "achievement":
+                awards.append(AchievementAwardRequest(studentId=student_id, **fields))
+                award_acks.append(ack)
+            elif kind == "challenge":
+                submissions.append(ChallengeSubmission(studentId=student_id, **fields))
+                submission_acks.append(ack)
+            elif kind == "ping":
+                ack["success"] = True
+            else:
+                ack.update(success=False, message=f"Unknown message type: {kind}")
+        except (ValidationError, TypeError, ValueError) as e:
+            ack.update(success=False, message=f"Invalid {kind} message: {channel_error(e)}")
+
+    if progress_acks:
+        try:
+            newer = store.sync_progress(student_id, updates, max(progress_times))
+            if newer is None:
+                publish_progress(student_id, connection)
+                reply["recommendations"] = recommendations.recommend(student_id, store.load_progress(student_id))
+                for ack in progress_acks:
+                    ack["success"] = True
+            else:
+                reply["serverData"] = newer
+                for ack in progress_acks:
+                    ack.update(success=False, conflict=True, message="Server has newer data")
+        except Exception as e:
+            for ack in progress_acks:
+                ack.update(success=False, message=f"Failed to sync progress: {str(e)}")
+
+    if awards:
+        try:
+            for ack, result in zip(award_acks, record_achievements(awards, connection)):
+                ack.update(result)
+        except Exception as e:
+            for ack in award_acks:
+                ack.update(success=False, message=f"Failed to award achievement: {str(e)}")
+
+    if submissions:
+        try:
+            for ack, submission, result in zip(submission_acks, submissions,
+                                               record_challenge_submissions(submissions, connection)):
+                if result is None:
+                    ack.update(success=False, message=f"Challenge not found for algorithm '{submission.algorithmId}'")
+                else:
+                    ack.update(success=True, result=result)
+        except Exception as e:
+            for ack in submission_acks:
+                ack.update(success=False, message=f"Failed to submit challenge: {str(e)}")
+
+    return reply
+
+
+@router.websocket("/ws/{student_id}")
+async def learning_path_channel(websocket: WebSocket, student_id: str):
+    """
+    Persistent two-way channel for one student
+    
+    Client messages ({"type": "progress" | "achievement" | "challenge" | "ping", "seq": n, ...})
+    take the same fields as the matching HTTP endpoints, minus studentId. Messages that
+    arrive together are answered by one {"type": "ack"}. The server pushes "progress",
+    "achievement" and "challenge" updates made from the student's other tabs or over HTTP.
+    """
+    await websocket.accept()
+    connection = Connection(websocket, student_id)
+    hub.connect(connection)
+    sender = asyncio.create_task(connection.send_loop())
+    receiver = asyncio.create_task(connection.receive_loop())
+    try:
+        connection.push(await run_in_threadpool(channel_hello, student_id))
+        while True:
+            frames = await connection.next_batch()
+            if frames is None:
+                break
+            reply = await run_in_threadpool(handle_channel_batch, student_id, frames, connection)
+            if not connection.push(reply):
+                # Client is not reading its acks
+                connection.abort()
+                break
+    finally:
+        hub.disconnect(connection)
+        receiver.cancel()
+        if not sender.done():
+            sender.cancel()
+        await asyncio.gather(sender, receiver, return_exceptions=True)
+
+
+# Batch student reads
+@router.post("/students/batch")
+def load_students_batch(batch_request: StudentBatchRequest):
+    """
+    Load progress, achievements and certificates for many students at once
+    Lets a teacher dashboard fetch a whole class in a single call
+    Requirements: 13.2, 8.2, 15.1
+    """
+    check_batch_size(batch_request.studentIds)
+    
+    valid_sections = {"progress", "achievements", "certificates"}
+    unknown = set(batch_request.include) - valid_sections
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid include values: {sorted(unknown)}. Must be among {sorted(valid_sections)}"
+        )
+    
+    try:
+        # Deduplicate while keeping the caller's order
+        student_ids = list(dict.fromkeys(batch_request.studentIds))
+        
+        progress = achievements = certificates = {}
+        if "progress" in batch_request.include:
+            progress = store.load_progress_many(student_ids)
+        if "achievements" in batch_request.include:
+            achievements = store.get_achievements_many(student_ids)
+        if "certificates" in batch_request.include:
+            certificates = store.get_certificates_many(student_ids)
+        
+        students = []
+        for student_id in student_ids:
+            entry: Dict[str, Any] = {"studentId": student_id}
+            if "progress" in batch_request.include:
+                entry["found"] = progress[student_id] is not None
+                entry["progress"] = progress[student_id] or empty_progress(student_id)
+            if "achievements" in batch_request.include:
+                entry["achievements"] = achievements[student_id]
+            if "certificates" in batch_request.include:
+                entry["certificates"] = certificates[student_id]
+            students.append(entry)
+        
+        return {
+            "success": True,
+            "count": len(students),
+            "students": students
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load students: {str(e)}")
+
+
+# Analytics endpoints
+@router.get("/analytics")
+def get_analytics(
+    algorithmId: Optional[str] = None,
+    challengeId: Optional[str] = None,
+    days: int = 30
+):
+    """
+    Cohort analytics: completion rate and challenge accuracy per algorithm,
+    per-challenge stats and per-day activity
+    Served from incrementally maintained rollups, no student scans
+    """
+    if not 1 <= days <= RETENTION_DAYS:
+        raise HTTPException(status_code=400, detail=f"days must be between 1 and {RETENTION_DAYS}")
+    try:
+        return {
+            "success": True,
+            "analytics": store.analytics(algorithmId, challengeId, days)
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to get analytics: {str(e)}")
@@ -0,0 +1,237 @@
+"""
+Learning Path Analytics
+Cohort rollups maintained incrementally on every learning-path write,
+so dashboard queries never have to scan student records
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Any
+import sqlite3
+
+# Statuses counted as finished when computing completion rates
+COMPLETED_STATUSES = {"completed", "mastered"}
+
+# Upper bucket edges for challenge time spent (seconds) and completion percentage
+TIME_SPENT_BUCKETS = [10, 30, 60, 120, 300, 600]
+COMPLETION_BUCKETS = [0, 25, 50, 75, 100]
+
+# Number of days of per-day rollups kept
+RETENTION_DAYS = 90
+
+DAY_METRICS = ["progressSaves", "progressSyncs", "challengeSubmissions",
+               "challengeCorrect", "achievementsAwarded", "activeStudents"]
+
+# Rollup tables, created by the learning path store alongside its own
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS analytics_counters (
+    scope TEXT NOT NULL,
+    key TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (scope, key, metric)
+);
+CREATE TABLE IF NOT EXISTS analytics_student_state (
+    student_id TEXT NOT NULL,
+    algorithm_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    PRIMARY KEY (student_id, algorithm_id)
+);
+CREATE TABLE IF NOT EXISTS analytics_day_students (
+    day TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    PRIMARY KEY (day, student_id)
+);
+"""
+
+
+def bucket_index(value: float, edges: List[float]) -> int:
+    """Index of the first bucket whose upper edge holds value (last index is overflow)"""
+    for i, edge in enumerate(edges):
+        if value <= edge:
+            return i
+    return len(edges)
+
+
+def bucket_labels(edges: List[float]) -> List[str]:
+    """Prometheus-style 'le' labels for a bucket edge list"""
+    return [f"<={edge}" for edge in edges] + [f">{edges[-1]}"]
+
+
+class AnalyticsRollups:
+    """
+    Counters and histograms per algorithm, per challenge and per day
+
+    Every write path feeds its delta in on the same SQLite connection and
+    transaction as the write itself, so rollups stay consistent with the
+    data across worker processes. Reads only touch the small counter table.
+    Per-student state is limited to the last seen status and completion
+    bucket of each algorithm, which is what lets a progress save move a
+    student between buckets instead of being counted twice.
+    """
+
+    @staticmethod
+    def _add(conn: sqlite3.Connection, scope: str, key: str, metric: str, amount: float = 1):
+        conn.execute(
+            "INSERT INTO analytics_counters (scope, key, metric, value) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (scope, key, metric) DO UPDATE SET value = value + excluded.value",
+            (scope, key, metric, amount)
+        )
+
+    def _add_day(self, conn: sqlite3.Connection, student_id: str, metric: str, amount: float = 1):
+        """Bump a per-day counter and count the student as active today"""
+        today = date.today().isoformat()
+        new_day = conn.execute(
+            "INSERT OR IGNORE INTO analytics_counters (scope, key, metric, value) VALUES ('day', ?, 'activeStudents', 0)",
+            (today,)
+        ).rowcount
+        if new_day:
+            # First write of the day, drop days past retention
+            cutoff = (date.today() - timedelta(days=RETENTION_DAYS)).isoformat()
+            conn.execute("DELETE FROM analytics_counters WHERE scope = 'day' AND key < ?", (cutoff,))
+            conn.execute("DELETE FROM analytics_day_students WHERE day < ?", (cutoff,))
+
+        self._add(conn, "day", today, metric, amount)
+        first_visit = conn.execute(
+            "INSERT OR IGNORE INTO analytics_day_students (day, student_id) VALUES (?, ?)",
+            (today, student_id)
+        ).rowcount
+        if first_visit:
+            self._add(conn, "day", today, "activeStudents")
+
+    # Write side
+    def record_progress(self, conn: sqlite3.Connection, student_id: str,
+                        algorithm_progress: Dict[str, Any], kind: str = "save"):
+        """
+        Apply a progress save or sync for one student
+        kind: 'save', 'sync' or 'seed' (seeding does not count as activity)
+        """
+        previous = {
+            row[0]: (row[1], row[2])
+            for row in conn.execute(
+                "SELECT algorithm_id, status, bucket FROM analytics_student_state WHERE student_id = ?",
+                (student_id,)
+            )
+        }
+        for algorithm_id, entry in (algorithm_progress or {}).items():
+            if not isinstance(entry, dict):
+                continue
+            status = entry.get("status", "not_started")
+            try:
+                percentage = float(entry.get("completionPercentage", 0) or 0)
+            except (TypeError, ValueError):
+                percentage = 0.0
+            current = (status, bucket_index(percentage, COMPLETION_BUCKETS))
+
+            old = previous.get(algorithm_id)
+            if old == current:
+                continue
+            if old is not None:
+                self._add(conn, "algorithm", algorithm_id, f"status:{old[0]}", -1)
+                self._add(conn, "algorithm", algorithm_id, f"completion:{old[1]}", -1)
+            self._add(conn, "algorithm", algorithm_id, f"status:{current[0]}")
+            self._add(conn, "algorithm", algorithm_id, f"completion:{current[1]}")
+            conn.execute(
+                "INSERT OR REPLACE INTO analytics_student_state (student_id, algorithm_id, status, bucket) "
+                "VALUES (?, ?, ?, ?)",
+                (student_id, algorithm_id, current[0], current[1])
+            )
+
+        if kind != "seed":
+            self._add_day(conn, student_id, "progressSaves" if kind == "save" else "progressSyncs")
+
+    def record_challenge(self, conn: sqlite3.Connection, student_id: str, algorithm_id: str,
+                         challenge_id: str, correct: bool, score: int, time_spent: int, seed: bool = False):
+        """Apply one graded challenge submission (seeded ones do not count as activity)"""
+        key = f"{algorithm_id}:{challenge_id}"
+        self._add(conn, "challenge", key, "attempts")
+        self._add(conn, "challenge", key, "correct", int(bool(correct)))
+        self._add(conn, "challenge", key, "totalScore", score)
+        self._add(conn, "challenge", key, "totalTimeSpent", max(time_spent, 0))
+        self._add(conn, "challenge", key, f"time:{bucket_index(time_spent, TIME_SPENT_BUCKETS)}")
+
+        self._add(conn, "algorithm", algorithm_id, "challengeAttempts")
+        self._add(conn, "algorithm", algorithm_id, "challengeCorrect", int(bool(correct)))
+
+        if not seed:
+            self._add_day(conn, student_id, "challengeSubmissions")
+            self._add_day(conn, student_id, "challengeCorrect", int(bool(correct)))
+
+    def record_achievement(self, conn: sqlite3.Connection, student_id: str, achievement_id: str, seed: bool = False):
+        """Apply one newly awarded achievement (seeded ones do not count as activity)"""
+        self._add(conn, "achievement", achievement_id, "awarded")
+        if not seed:
+            self._add_day(conn, student_id, "achievementsAwarded")
+
+    # Read side
+    @staticmethod
+    def algorithm_summary(algorithm_id: str, counters: Dict[str, float]) -> Dict[str, Any]:
+        status_counts = {
+            metric.split(":", 1)[1]: int(value)
+            for metric, value in counters.items()
+            if metric.startswith("status:") and value
+        }
+        tracked = sum(status_counts.values())
+        completed = sum(status_counts.get(s, 0) for s in COMPLETED_STATUSES)
+        attempts = counters.get("challengeAttempts", 0)
+        histogram = [int(counters.get(f"completion:{i}", 0)) for i in range(len(COMPLETION_BUCKETS) + 1)]
+        return {
+            "algorithmId": algorithm_id,
+            "students": tracked,
+            "statusCounts": status_counts,
+            "completionRate": completed / tracked if tracked else 0.0,
+            "completionHistogram": dict(zip(bucket_labels(COMPLETION_BUCKETS), histogram)),
+            "challengeAttempts": int(attempts),
+            "challengeAccuracy": counters.get("challengeCorrect", 0) / attempts if attempts else 0.0,
+        }
+
+    @staticmethod
+    def challenge_summary(key: str, counters: Dict[str, float]) -> Dict[str, Any]:
+        algorithm_id, challenge_id = key.split(":", 1)
+        attempts = counters.get("attempts", 0)
+        histogram = [int(counters.get(f"time:{i}", 0)) for i in range(len(TIME_SPENT_BUCKETS) + 1)]
+        return {
+            "challengeId": challenge_id,
+            "algorithmId": algorithm_id,
+            "attempts": int(attempts),
+            "accuracy": counters.get("correct", 0) / attempts if attempts else 0.0,
+            "averageScore": counters.get("totalScore", 0) / attempts if attempts else 0.0,
+            "averageTimeSpent": counters.get("totalTimeSpent", 0) / attempts if attempts else 0.0,
+            "timeSpentHistogram": dict(zip(bucket_labels(TIME_SPENT_BUCKETS), histogram)),
+        }
+
+    def snapshot(self, conn: sqlite3.Connection, algorithm_id: Optional[str] = None,
+                 challenge_id: Optional[str] = None, days: int = 30) -> Dict[str, Any]:
+        """Dashboard view of the rollups, optionally narrowed to one algorithm or challenge"""
+        cutoff = (date.today() - timedelta(days=min(days, RETENTION_DAYS) - 1)).isoformat()
+        counters: Dict[str, Dict[str, Dict[str, float]]] = defaultdict(lambda: defaultdict(dict))
+        for scope, key, metric, value in conn.execute(
+            "SELECT scope, key, metric, value FROM analytics_counters "
+            "WHERE scope IN ('algorithm', 'challenge', 'achievement') OR (scope = 'day' AND key >= ?)",
+            (cutoff,)
+        ):
+            counters[scope][key][metric] = value
+
+        algorithm_ids = [algorithm_id] if algorithm_id else sorted(counters["algorithm"])
+        challenge_keys = sorted(
+            key for key in counters["challenge"]
+            if (not algorithm_id or key.split(":", 1)[0] == algorithm_id)
+            and (not challenge_id or key.split(":", 1)[1] == challenge_id)
+        )
+        daily = []
+        for day in sorted(counters["day"]):
+            entry = {metric: int(counters["day"][day].get(metric, 0)) for metric in DAY_METRICS}
+            entry["date"] = day
+            daily.append(entry)
+
+        return {
+            "algorithms": [self.algorithm_summary(a, counters["algorithm"].get(a, {})) for a in algorithm_ids],
+            "challenges": [self.challenge_summary(k, counters["challenge"][k]) for k in challenge_keys],
+            "achievements": {k: int(v.get("awarded", 0)) for k, v in counters["achievement"].items()},
+            "daily": daily,
+        }
+
+
+# Shared rollups for the learning path store
+rollups = AnalyticsRollups()
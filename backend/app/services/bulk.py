@@ -0,0 +1,153 @@
+"""
+Bulk Import
+Incremental NDJSON parser that writes exported learning path records to the
+store in batches, resumable from a saved cursor
+"""
+
+from typing import Dict, List, Optional, Any
+import json
+
+from services.store import EXPORT_QUERIES, store
+
+# Records written per transaction
+IMPORT_BATCH_SIZE = 500
+
+# Longest NDJSON line accepted before the import is aborted
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+# Line errors kept in the summary (all are counted)
+MAX_REPORTED_ERRORS = 100
+
+# Fields every record of a type must carry
+REQUIRED_FIELDS = {
+    "progress": ("studentId", "data"),
+    "achievement": ("studentId", "achievementId", "earnedDate"),
+    "certificate": ("studentId", "data"),
+    "challenge_submission": ("studentId", "algorithmId", "data"),
+    "challenge_served": ("studentId", "algorithmId", "challengeId"),
+}
+
+# Export bookkeeping lines, skipped on import
+SKIPPED_TYPES = ("header", "cursor")
+
+
+def validate_record(record: Any) -> Optional[str]:
+    """Reason a record cannot be imported, or None if it is valid"""
+    if not isinstance(record, dict):
+        return "record must be a JSON object"
+    kind = record.get("type")
+    if kind not in EXPORT_QUERIES:
+        return f"unknown record type '{kind}'"
+    missing = [field for field in REQUIRED_FIELDS[kind] if field not in record]
+    if missing:
+        return f"missing fields {missing}"
+    if not isinstance(record["studentId"], str):
+        return "studentId must be a string"
+    if "data" in REQUIRED_FIELDS[kind] and not isinstance(record["data"], dict):
+        return "data must be a JSON object"
+    if kind == "certificate" and "certificateId" not in record["data"]:
+        return "certificate data has no certificateId"
+    return None
+
+
+class ImportSession:
+    """
+    Consumes an NDJSON stream chunk by chunk
+
+    Only the current partial line and one batch of records are held in
+    memory. Each batch is committed together with the number of lines
+    consumed so far, so an import re-run with the same import_id skips
+    everything already written.
+    """
+
+    def __init__(self, import_id: Optional[str] = None, batch_size: int = IMPORT_BATCH_SIZE,
+                 skip_lines: Optional[int] = None):
+        self.import_id = import_id
+        self.batch_size = batch_size
+        if skip_lines is None:
+            skip_lines = store.import_cursor(import_id) if import_id else 0
+        self.skip_lines = skip_lines
+        self.line_number = 0
+        self.cursor = skip_lines
+        self.counts: Dict[str, int] = {}
+        self.errors: List[Dict[str, Any]] = []
+        self.error_count = 0
+        # Pieces of the current, unterminated line
+        self._partial: List[bytes] = []
+        self._partial_bytes = 0
+        self._pending: List[Dict[str, Any]] = []
+
+    def feed(self, chunk: bytes):
+        pieces = chunk.split(b"\n")
+        if len(pieces) == 1:
+            self._partial.append(chunk)
+            self._partial_bytes += len(chunk)
+            if self._partial_bytes > MAX_LINE_BYTES:
+                raise ValueError(f"Line {self.line_number + 1} is longer than {MAX_LINE_BYTES} bytes")
+            return
+        self._line(b"".join(self._partial) + pieces[0])
+        for line in pieces[1:-1]:
+            self._line(line)
+        self._partial = [pieces[-1]] if pieces[-1] else []
+        self._partial_bytes = len(pieces[-1])
+
+    def _line(self, line: bytes):
+        self.line_number += 1
+        if self.line_number <= self.skip_lines:
+            return
+        line = line.strip()
+        if line:
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                self._error(f"invalid JSON: {e}")
+                return
+            if isinstance(record, dict) and record.get("type") in SKIPPED_TYPES:
+                return
+            reason = validate_record(record)
+            if reason is not None:
+                self._error(reason)
+                return
+            self._pending.append(record)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def _error(self, message: str):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": self.line_number, "message": message})
+
+    def flush(self, cursor: Optional[int] = None):
+        """Write pending records and advance the saved cursor (default: all lines read)"""
+        cursor = self.line_number if cursor is None else cursor
+        if not self._pending and cursor <= self.cursor:
+            return
+        counts = store.import_records(self._pending, self.import_id, cursor=cursor)
+        for kind, count in counts.items():
+            self.counts[kind] = self.counts.get(kind, 0) + count
+        self._pending = []
+        self.cursor = cursor
+
+    def finish(self) -> Dict[str, Any]:
+        """Process the last line, write what is left and summarize"""
+        complete = self.line_number
+        errors = self.error_count
+        if self._partial:
+            line = b"".join(self._partial)
+            self._partial, self._partial_bytes = [], 0
+            self._line(line)
+        if self.error_count > errors:
+            # An unterminated line that fails is most likely a cut-off upload,
+            # so leave it to be read again when the import is resumed
+            self.flush(cursor=max(complete, self.cursor))
+        else:
+            self.flush()
+        return {
+            "importId": self.import_id,
+            "imported": self.counts,
+            "lines": self.line_number,
+            "resumedFrom": self.skip_lines,
+            "cursor": self.cursor,
+            "errorCount": self.error_count,
+            "errors": self.errors,
+        }
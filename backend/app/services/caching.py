@@ -0,0 +1,96 @@
+"""
+Caching
+Small in-memory caching helpers shared by the content services: a bounded
+LRU mapping and a throttled watch that reloads an index when its content
+directory changes
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Hashable, Optional
+import os
+import threading
+import time
+
+# Returned by LRUCache.get on a miss when None is a cacheable value
+MISSING = object()
+
+
+class LRUCache:
+    """Thread-safe mapping that drops its least recently used entries beyond capacity"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            return self._entries.pop(key, default)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DirectoryWatch:
+    """
+    Reloads an in-memory index when the files in a content directory change
+
+    The check is a directory stat throttled to once per interval. The
+    signature is taken before load() reads the files, so a change made
+    while loading is picked up by the next check.
+    """
+
+    def __init__(self, directory: Path, load: Callable[[], None], interval: float, suffix: str = ".json"):
+        self.directory = directory
+        self.load = load
+        self.interval = interval
+        self.suffix = suffix
+        self._signature: Optional[tuple] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+
+    def signature(self) -> tuple:
+        if not self.directory.exists():
+            return ()
+        return tuple(sorted(
+            (entry.name, entry.stat().st_mtime_ns, entry.stat().st_size)
+            for entry in os.scandir(self.directory)
+            if entry.name.endswith(self.suffix)
+        ))
+
+    def reload(self):
+        """Load unconditionally"""
+        signature = self.signature()
+        self.load()
+        self._signature = signature
+
+    def maybe_reload(self):
+        """Reload if the directory changed since the last check"""
+        now = time.monotonic()
+        if self._signature is not None and now - self._last_check < self.interval:
+            return
+        with self._lock:
+            if self._signature is not None and now - self._last_check < self.interval:
+                return
+            self._last_check = now
+            if self.signature() != self._signature:
+                self.reload()
@@ -0,0 +1,217 @@
+"""
+Content Catalog
+In-memory index of algorithm documents loaded from content/algorithms, with
+equations pre-rendered and sparse projections cached as ready-to-send JSON
+"""
+
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any, Tuple
+import json
+import threading
+
+from services.caching import DirectoryWatch, LRUCache
+from services.equations import equations
+from services.metrics import record_cache
+from services.params import split_values
+
+# Path to algorithm content
+CONTENT_DIR = Path(__file__).parent.parent.parent.parent / "content" / "algorithms"
+
+# Seconds between checks of the content directory for changes
+RELOAD_INTERVAL = 2.0
+
+# Encoded projections kept in memory
+PROJECTION_CACHE_SIZE = 2048
+
+# Upper bound on selectors in one projection
+MAX_SELECTORS = 50
+
+# Fields in /list entries when no projection is given
+SUMMARY_FIELDS = ("id", "name", "category", "difficulty", "estimatedTime")
+
+# A projection is a normalized tuple of selectors (JSON paths); None means the whole document
+Selector = Tuple[str, ...]
+Projection = Optional[Tuple[Selector, ...]]
+
+
+def parse_pointer(pointer: str) -> Selector:
+    """Parse a JSON pointer (RFC 6901), e.g. /sections/mathematical_model/equations"""
+    if pointer == "":
+        return ()
+    if not pointer.startswith("/"):
+        raise ValueError(f"Invalid selector '{pointer}': JSON pointers start with '/'")
+    return tuple(token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/"))
+
+
+def build_projection(fields: Optional[List[str]] = None, sections: Optional[List[str]] = None,
+                     select: Optional[List[str]] = None) -> Projection:
+    """
+    Combine fields= (top-level keys), sections= (keys under 'sections') and
+    select= (JSON pointers) into one projection
+    Returns None when nothing was requested
+    """
+    paths = [(field,) for field in split_values(fields)]
+    paths += [("sections", section) for section in split_values(sections)]
+    paths += [parse_pointer(pointer) for pointer in split_values(select)]
+    if not paths:
+        return None
+    if len(paths) > MAX_SELECTORS:
+        raise ValueError(f"Too many selectors: {len(paths)} (max {MAX_SELECTORS})")
+    if () in paths:
+        return None
+
+    # Drop paths already covered by a shorter one, so equivalent requests share a cache entry
+    normalized: List[Selector] = []
+    for path in sorted(set(paths)):
+        if not any(path[:len(kept)] == kept for kept in normalized):
+            normalized.append(path)
+    return tuple(normalized)
+
+
+def projection_tree(projection: Tuple[Selector, ...]) -> Dict[str, Any]:
+    """Nested dict of path tokens; an empty dict marks a selected subtree"""
+    tree: Dict[str, Any] = {}
+    for path in projection:
+        node = tree
+        for token in path[:-1]:
+            node = node.setdefault(token, {})
+        node[path[-1]] = {}
+    return tree
+
+
+def apply_tree(value: Any, tree: Dict[str, Any]) -> Any:
+    """
+    Project a value through a tree of selectors
+    Keys keep document order and missing ones are left out; array elements
+    picked by index keep their relative order
+    """
+    if not tree:
+        return value
+    if isinstance(value, dict):
+        return {key: apply_tree(item, tree[key]) for key, item in value.items() if key in tree}
+    if isinstance(value, list):
+        indices = sorted(int(key) for key in tree if key.isdigit() and int(key) < len(value))
+        return [apply_tree(value[i], tree[str(i)]) for i in indices]
+    return value
+
+
+def project(document: Dict[str, Any], projection: Projection) -> Any:
+    if projection is None:
+        return document
+    return apply_tree(document, projection_tree(projection))
+
+
+def encode(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class ContentCatalog:
+    """
+    Algorithm documents indexed by ID
+
+    Documents are parsed once and reloaded when the content directory
+    changes (checked at most once per RELOAD_INTERVAL). Equations get their
+    MathML rendered at load time, next to the LaTeX. Each distinct
+    projection of a document is encoded to JSON once and kept in an LRU
+    cache, which is emptied whenever the content is reloaded.
+    """
+
+    def __init__(self, content_dir: Path = CONTENT_DIR, reload_interval: float = RELOAD_INTERVAL,
+                 cache_size: int = PROJECTION_CACHE_SIZE):
+        self.content_dir = content_dir
+        self._documents: Dict[str, Dict[str, Any]] = {}
+        self._watch = DirectoryWatch(content_dir, self._load, reload_interval)
+        self._cache = LRUCache(cache_size)
+        self._cache_lock = threading.Lock()
+
+    # Loading
+    def reload(self):
+        """Re-read every document unconditionally"""
+        self._watch.reload()
+
+    def maybe_reload(self):
+        """Reload if the content directory changed since the last check"""
+        self._watch.maybe_reload()
+
+    def _load(self):
+        documents: Dict[str, Dict[str, Any]] = {}
+
+        for file_path in sorted(self.content_dir.glob("*.json")) if self.content_dir.exists() else []:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"Error loading {file_path}: {e}")
+                continue
+            equations.prerender(data)
+            # Documents are served by file name, as before the catalog existed
+            documents[file_path.stem] = data
+
+        with self._cache_lock:
+            self._documents = documents
+            self._cache.clear()
+
+    # Lookups
+    def get(self, algorithm_id: str) -> Optional[Dict[str, Any]]:
+        self.maybe_reload()
+        return self._documents.get(algorithm_id)
+
+    def documents(self) -> List[Dict[str, Any]]:
+        self.maybe_reload()
+        return list(self._documents.values())
+
+    def _cached(self, documents: Dict[str, Dict[str, Any]], key: Tuple[str, Projection],
+                build: Callable[[], Any]) -> bytes:
+        """Encoded result of build() for the given document set, from the cache when possible"""
+        with self._cache_lock:
+            encoded = self._cache.get(key) if documents is self._documents else None
+        record_cache("content_projections", hits=int(encoded is not None), misses=int(encoded is None))
+        if encoded is None:
+            encoded = encode(build())
+            with self._cache_lock:
+                # Skip caching if a reload swapped the documents meanwhile
+                if documents is self._documents:
+                    self._cache.put(key, encoded)
+        return encoded
+
+    def projected(self, algorithm_id: str, projection: Projection) -> Optional[bytes]:
+        """Encoded projection of one document, or None if the algorithm is unknown"""
+        self.maybe_reload()
+        documents = self._documents
+        document = documents.get(algorithm_id)
+        if document is None:
+            return None
+        return self._cached(documents, (algorithm_id, projection), lambda: project(document, projection))
+
+    def listing(self, projection: Projection) -> bytes:
+        """Encoded /list response, sorted by category and difficulty"""
+        self.maybe_reload()
+        documents = self._documents
+
+        def build():
+            ordered = sorted(documents.values(), key=lambda d: (d.get("category"), d.get("difficulty")))
+            if projection is None:
+                algorithms = [{field: d.get(field) for field in SUMMARY_FIELDS} for d in ordered]
+            else:
+                algorithms = [project(d, projection) for d in ordered]
+            return {"algorithms": algorithms, "count": len(algorithms)}
+
+        # Algorithm IDs are never empty, so "" is free to key the listing
+        return self._cached(documents, ("", projection), build)
+
+    def batch(self, algorithm_ids: List[str], projection: Projection) -> bytes:
+        """Encoded batch response assembled from the per-document cache entries"""
+        parts: List[bytes] = []
+        missing: List[str] = []
+        for algorithm_id in algorithm_ids:
+            encoded = self.projected(algorithm_id, projection)
+            if encoded is None:
+                missing.append(algorithm_id)
+            else:
+                parts.append(encoded)
+        return (b'{"algorithms":[' + b",".join(parts) + b'],"count":' + str(len(parts)).encode()
+                + b',"missing":' + encode(missing) + b"}")
+
+
+# Shared catalog for the algorithm routes
+catalog = ContentCatalog()
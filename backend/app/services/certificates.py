@@ -0,0 +1,196 @@
+"""
+Certificate Rendering
+Renders certificates to PDF/PNG in a background process pool and keeps the
+output in a content-addressed on-disk cache
+"""
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Dict, Optional, Any, Tuple
+import hashlib
+import json
+import multiprocessing
+import os
+import threading
+
+from services.caching import LRUCache
+
+# Cache directory for rendered artifacts
+CACHE_DIR = os.getenv("CERTIFICATE_CACHE_DIR", os.path.join(os.path.dirname(__file__), '..', 'data', 'certificates'))
+
+# Bump when the layout changes so old artifacts are not served
+TEMPLATE_VERSION = 1
+
+FORMATS = {
+    "pdf": "application/pdf",
+    "png": "image/png",
+}
+
+RENDER_WORKERS = int(os.getenv("CERTIFICATE_RENDER_WORKERS", "2"))
+
+# Failed renders remembered until their next download reports them
+FAILED_RENDERS = 1024
+
+
+def render_spec(certificate: Dict[str, Any]) -> Dict[str, Any]:
+    """Fields that determine what a certificate looks like"""
+    return {
+        "template": TEMPLATE_VERSION,
+        "certificateType": certificate["certificateType"],
+        "studentName": certificate["studentName"],
+        "completionDate": certificate["completionDate"][:10],
+    }
+
+
+def content_key(spec: Dict[str, Any], fmt: str) -> str:
+    payload = json.dumps({"spec": spec, "format": fmt}, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def artifact_path(key: str, fmt: str) -> str:
+    return os.path.join(CACHE_DIR, key[:2], f"{key}.{fmt}")
+
+
+def draw_certificate(spec: Dict[str, Any], fmt: str) -> bytes:
+    """Lay out a certificate with matplotlib and return the encoded file"""
+    # Imported here so the API process does not pay for matplotlib until a render runs
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.patches import Rectangle
+
+    fig = Figure(figsize=(11, 8.5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_axes([0, 0, 1, 1])
+    ax.set_axis_off()
+    ax.add_patch(Rectangle((0.03, 0.04), 0.94, 0.92, fill=False, linewidth=4, edgecolor="#1e3a8a"))
+    ax.add_patch(Rectangle((0.05, 0.07), 0.90, 0.86, fill=False, linewidth=1, edgecolor="#3b82f6"))
+
+    title = spec["certificateType"].replace("_", " ").title()
+    ax.text(0.5, 0.80, "Certificate of Completion", ha="center", fontsize=34, color="#1e3a8a", weight="bold")
+    ax.text(0.5, 0.66, "This certifies that", ha="center", fontsize=16, color="#374151")
+    ax.text(0.5, 0.55, spec["studentName"], ha="center", fontsize=30, color="#111827", style="italic")
+    ax.text(0.5, 0.44, "has successfully completed", ha="center", fontsize=16, color="#374151")
+    ax.text(0.5, 0.35, title, ha="center", fontsize=24, color="#1e40af", weight="bold")
+    ax.text(0.5, 0.20, f"Completed on {spec['completionDate']}", ha="center", fontsize=14, color="#4b5563")
+    ax.text(0.5, 0.12, "ML Algorithms Learning Platform", ha="center", fontsize=12, color="#6b7280")
+
+    buffer = BytesIO()
+    metadata = {"CreationDate": None} if fmt == "pdf" else None
+    fig.savefig(buffer, format=fmt, dpi=150, metadata=metadata)
+    return buffer.getvalue()
+
+
+def render_artifact(spec: Dict[str, Any], fmt: str, path: str):
+    """Draw a certificate and write it to its cache path (runs in a render process)"""
+    data = draw_certificate(spec, fmt)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def warm_up_process():
+    """Load matplotlib, its fonts and backends in a render process"""
+    spec = render_spec({"certificateType": "warmup", "studentName": "Warmup", "completionDate": "2000-01-01"})
+    for fmt in FORMATS:
+        draw_certificate(spec, fmt)
+
+
+class CertificateRenderer:
+    """
+    Background renderer with a content-addressed artifact cache
+
+    Artifacts are keyed by a hash of their render inputs, so re-issued
+    certificates with identical content share one file, and a key that is
+    already on disk or already rendering is never rendered again. Rendering
+    is CPU-bound and holds the GIL, so it runs in separate processes rather
+    than threads of the API process.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, workers: int = RENDER_WORKERS):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Future] = {}
+        self._failed = LRUCache(FAILED_RENDERS)
+        # Reentrant: a job that is already done runs its callback in the submitting thread
+        self._lock = threading.RLock()
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Spawned, not forked: the API process has threads and open SQLite connections
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    def shutdown(self):
+        """Cancel queued renders and wait for the render processes to exit"""
+        if self._executor is not None:
+            # Without waiting, an exiting parent can be left joining workers that were never told to stop
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    def warm_up(self):
+        """Start every render process and have each load matplotlib ahead of the first certificate"""
+        jobs = [self.executor.submit(warm_up_process) for _ in range(self.workers)]
+        for job in jobs:
+            job.result()
+
+    def register(self, certificate: Dict[str, Any]):
+        """Queue renders of a certificate for every format"""
+        spec = render_spec(certificate)
+        for fmt in FORMATS:
+            self._schedule(spec, fmt)
+
+    def _schedule(self, spec: Dict[str, Any], fmt: str) -> str:
+        key = content_key(spec, fmt)
+        path = artifact_path(key, fmt)
+        with self._lock:
+            job = self._jobs.get(key)
+            if os.path.exists(path) or (job is not None and not job.done()):
+                return key
+            try:
+                job = self.executor.submit(render_artifact, spec, fmt, path)
+            except BrokenProcessPool:
+                # A render process died; start a fresh pool
+                self._executor = None
+                job = self.executor.submit(render_artifact, spec, fmt, path)
+            self._jobs[key] = job
+            job.add_done_callback(lambda done: self._finished(key, done))
+        return key
+
+    def _finished(self, key: str, job: Future):
+        """Forget a finished job, keeping its error for the next download to report"""
+        with self._lock:
+            if self._jobs.get(key) is job:
+                del self._jobs[key]
+            if not job.cancelled() and job.exception() is not None:
+                self._failed.put(key, job.exception())
+
+    def artifact(self, certificate: Dict[str, Any], fmt: str) -> Tuple[str, Optional[str], str]:
+        """
+        Look up a rendered artifact
+        Returns (status, path, key) where status is 'ready', 'pending' or 'failed'
+        """
+        spec = render_spec(certificate)
+        key = content_key(spec, fmt)
+        path = artifact_path(key, fmt)
+        if os.path.exists(path):
+            return "ready", path, key
+
+        error = self._failed.pop(key)
+        if error is not None:
+            print(f"Error rendering certificate {certificate['certificateId']}: {error}")
+            return "failed", None, key
+
+        # Not on disk and not rendering here (cache cleared, or issued by another worker), so queue it
+        self._schedule(spec, fmt)
+        return "pending", None, key
+
+
+# Shared renderer for the learning path and certificate routes
+renderer = CertificateRenderer()
@@ -0,0 +1,137 @@
+"""
+Challenge Bank
+In-memory index of practice challenges loaded from content/challenges,
+used to serve challenges and grade submissions without per-request file reads
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Set, Tuple
+import json
+import random
+
+from services.caching import DirectoryWatch
+
+# Path to challenge content, next to content/algorithms
+CHALLENGES_DIR = Path(__file__).parent.parent.parent.parent / "content" / "challenges"
+
+# Seconds between checks of the content directory for changes
+RELOAD_INTERVAL = 2.0
+
+# Fields hidden from students until they submit
+ANSWER_FIELDS = ("correctAnswer", "explanation")
+
+REQUIRED_FIELDS = ("id", "question", "options", "correctAnswer")
+
+
+def normalize_answer(answer: str) -> str:
+    return " ".join(str(answer).split()).casefold()
+
+
+class ChallengeBank:
+    """
+    Challenges indexed by algorithm ID and challenge ID
+
+    The index is rebuilt when a file in the content directory changes. The
+    check is a directory stat throttled to once per RELOAD_INTERVAL, and a
+    rebuild swaps in fresh dicts in one assignment, so readers always see
+    either the old or the new index.
+    """
+
+    def __init__(self, content_dir: Path = CHALLENGES_DIR, reload_interval: float = RELOAD_INTERVAL):
+        self.content_dir = content_dir
+        self._index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._answers: Dict[Tuple[str, str], str] = {}
+        self._watch = DirectoryWatch(content_dir, self._load, reload_interval)
+
+    # Loading
+    def reload(self):
+        """Rebuild the index from disk unconditionally"""
+        self._watch.reload()
+
+    def maybe_reload(self):
+        """Reload if the content directory changed since the last check"""
+        self._watch.maybe_reload()
+
+    def _load(self):
+        index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        answers: Dict[Tuple[str, str], str] = {}
+
+        for file_path in sorted(self.content_dir.glob("*.json")) if self.content_dir.exists() else []:
+            try:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"Error loading {file_path}: {e}")
+                continue
+
+            default_algorithm = data.get("algorithmId", file_path.stem)
+            for challenge in data.get("challenges", []):
+                missing = [k for k in REQUIRED_FIELDS if k not in challenge]
+                if missing:
+                    print(f"Skipping challenge in {file_path}: missing {missing}")
+                    continue
+                if challenge["correctAnswer"] not in challenge["options"]:
+                    print(f"Skipping challenge '{challenge['id']}' in {file_path}: correctAnswer not among options")
+                    continue
+                algorithm_id = challenge.setdefault("algorithmId", default_algorithm)
+                index.setdefault(algorithm_id, {})[challenge["id"]] = challenge
+                answers[(algorithm_id, challenge["id"])] = normalize_answer(challenge["correctAnswer"])
+
+        self._index, self._answers = index, answers
+
+    # Lookups
+    def get(self, algorithm_id: str, challenge_id: str) -> Optional[Dict[str, Any]]:
+        self.maybe_reload()
+        return self._index.get(algorithm_id, {}).get(challenge_id)
+
+    def for_algorithm(self, algorithm_id: str) -> List[Dict[str, Any]]:
+        self.maybe_reload()
+        return list(self._index.get(algorithm_id, {}).values())
+
+    def algorithm_ids(self) -> List[str]:
+        self.maybe_reload()
+        return sorted(self._index)
+
+    def pick(self, algorithm_id: str, served: Optional[Set[str]] = None) -> Tuple[Optional[Dict[str, Any]], bool]:
+        """
+        Pick a challenge a student has not been served yet
+        served: challenge IDs already shown to the student in this round,
+        or None for a deterministic pick (the algorithm's first challenge)
+        Returns (challenge, new_round), new_round being True when every
+        challenge had been served and the round starts over
+        """
+        self.maybe_reload()
+        challenges = self._index.get(algorithm_id)
+        if not challenges:
+            return None, False
+        if served is None:
+            return next(iter(challenges.values())), False
+
+        remaining = [cid for cid in challenges if cid not in served]
+        new_round = not remaining
+        challenge_id = random.choice(remaining or list(challenges))
+        return challenges[challenge_id], new_round
+
+    def grade(self, algorithm_id: str, challenge_id: str, selected_answer: str) -> Optional[Dict[str, Any]]:
+        """Grade an answer, or return None if the challenge is unknown"""
+        self.maybe_reload()
+        challenge = self._index.get(algorithm_id, {}).get(challenge_id)
+        expected = self._answers.get((algorithm_id, challenge_id))
+        if challenge is None or expected is None:
+            return None
+        correct = normalize_answer(selected_answer) == expected
+        return {
+            "correct": correct,
+            "score": 100 if correct else 0,
+            "feedback": "Great job!" if correct else "Not quite. Review the hint and try again.",
+            "explanation": challenge.get("explanation", "")
+        }
+
+    @staticmethod
+    def public_view(challenge: Dict[str, Any]) -> Dict[str, Any]:
+        """Challenge as shown to a student, without the answer"""
+        return {k: v for k, v in challenge.items() if k not in ANSWER_FIELDS}
+
+
+# Shared bank for the learning path routes
+challenge_bank = ChallengeBank()
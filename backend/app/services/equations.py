@@ -0,0 +1,85 @@
+"""
+Equation Rendering
+Pre-renders the LaTeX of algorithm equations to MathML when content is
+loaded, so pages can show them without client-side math layout
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import logging
+
+from services.caching import MISSING, LRUCache
+from services.metrics import record_cache
+
+logger = logging.getLogger(__name__)
+
+# Rendered equations kept in memory, shared across content reloads
+EQUATION_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=None)
+def converter() -> Optional[Callable[..., str]]:
+    """latex2mathml's converter, imported on first use to keep app import fast"""
+    try:
+        from latex2mathml.converter import convert
+    except ImportError:  # Optional: without it equations are served as LaTeX only
+        logger.warning("latex2mathml is not installed; equations are served as LaTeX only")
+        return None
+    return convert
+
+
+def latex_hash(latex: str) -> str:
+    return hashlib.sha256(latex.encode("utf-8")).hexdigest()
+
+
+class EquationRenderer:
+    """
+    LaTeX to MathML renderer with a cache keyed by a hash of the source
+
+    Each distinct equation is rendered once per process; reloading content
+    only renders equations whose LaTeX changed. Equations that fail to
+    render are cached too (as None) and keep only their LaTeX.
+    """
+
+    def __init__(self, cache_size: int = EQUATION_CACHE_SIZE):
+        self._cache = LRUCache(cache_size)
+
+    def render(self, latex: str) -> Optional[str]:
+        """MathML for a display equation, or None if it cannot be rendered"""
+        convert = converter()
+        if convert is None:
+            return None
+        key = latex_hash(latex)
+        mathml = self._cache.get(key, MISSING)
+        hit = mathml is not MISSING
+        record_cache("equations", hits=int(hit), misses=int(not hit))
+        if hit:
+            return mathml
+
+        try:
+            mathml = convert(latex, display="block")
+        except Exception as e:
+            logger.warning(f"Could not render equation {latex!r}: {e}")
+            mathml = None
+        self._cache.put(key, mathml)
+        return mathml
+
+    def prerender(self, document: Dict[str, Any]):
+        """Add a 'mathml' field next to the 'latex' of each equation in the mathematical model"""
+        if converter() is None:
+            return
+        sections = document.get("sections")
+        model = sections.get("mathematical_model") if isinstance(sections, dict) else None
+        equations = model.get("equations") if isinstance(model, dict) else None
+        if not isinstance(equations, list):
+            return
+        for equation in equations:
+            if isinstance(equation, dict) and isinstance(equation.get("latex"), str):
+                mathml = self.render(equation["latex"])
+                if mathml is not None:
+                    equation["mathml"] = mathml
+
+
+# Shared renderer for the content catalog
+equations = EquationRenderer()
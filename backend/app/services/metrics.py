@@ -0,0 +1,325 @@
+"""
+Metrics
+Counters, gauges and histograms for the API hot paths, exported in the
+Prometheus text format at /metrics
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+import asyncio
+import threading
+import time
+
+# Latency buckets in seconds, from sub-millisecond cache hits to slow evaluations
+LATENCY_BUCKETS = [0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+
+# Size buckets in bytes
+SIZE_BUCKETS = [128, 512, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304]
+
+# Seconds between event loop lag samples
+LOOP_LAG_INTERVAL = 0.5
+
+
+def format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = list(self._values.items())
+        return self.header() + [
+            f"{self.name}{format_labels(self.labelnames, labels)} {format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels: str, value: float):
+        with self._lock:
+            self._values[labels] = value
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+    @contextmanager
+    def track(self, *labels: str) -> Iterator[None]:
+        """Count something as in progress for the duration of a block"""
+        self.inc(*labels)
+        try:
+            yield
+        finally:
+            self.dec(*labels)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = (),
+                 buckets: List[float] = LATENCY_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = list(buckets)
+        # Per label set: [bucket counts..., +Inf count], sum
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, *labels: str, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(labels)
+            if entry is None:
+                entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+            entry[0][index] += 1
+            entry[1][0] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(*labels, value=time.perf_counter() - start)
+
+    def count(self, *labels: str) -> int:
+        entry = self._values.get(labels)
+        return sum(entry[0]) if entry else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = [(labels, list(counts), total[0]) for labels, (counts, total) in self._values.items()]
+        lines = self.header()
+        for labels, counts, total in items:
+            cumulative = 0
+            for edge, count in zip(self.buckets + [float("inf")], counts):
+                cumulative += count
+                le = f'le="{format_value(edge)}"'
+                lines.append(f"{self.name}_bucket{format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{format_labels(self.labelnames, labels)} {format_value(total)}")
+            lines.append(f"{self.name}_count{format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+http_requests = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests by route and status", ("method", "route", "status")))
+http_latency = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route")))
+http_request_size = REGISTRY.register(Histogram(
+    "http_request_size_bytes", "HTTP request body size", ("method", "route"), SIZE_BUCKETS))
+http_response_size = REGISTRY.register(Histogram(
+    "http_response_size_bytes", "HTTP response body size", ("method", "route"), SIZE_BUCKETS))
+http_in_flight = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled"))
+loop_lag = REGISTRY.register(Histogram(
+    "event_loop_lag_seconds", "Delay between when the event loop sampler should wake and when it does"))
+storage_latency = REGISTRY.register(Histogram(
+    "storage_operation_duration_seconds", "Learning path store operation latency", ("operation",)))
+execution_in_progress = REGISTRY.register(Gauge(
+    "execution_in_progress", "Code execution and evaluation requests in progress", ("endpoint",)))
+cache_requests = REGISTRY.register(Counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit or miss)", ("cache", "result")))
+websocket_connections = REGISTRY.register(Gauge(
+    "websocket_connections", "Open learning path WebSocket connections"))
+websocket_messages = REGISTRY.register(Counter(
+    "websocket_messages_total", "WebSocket messages by direction (in or out)", ("direction",)))
+startup_step_duration = REGISTRY.register(Gauge(
+    "startup_warmup_step_seconds", "Seconds spent in each startup warmup step", ("step",)))
+app_ready = REGISTRY.register(Gauge(
+    "app_ready", "1 once startup warmup has finished and the app reports ready"))
+
+
+def timed_storage(operation: str) -> Callable:
+    """Decorator recording a store method's latency under the given operation name"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                storage_latency.observe(operation, value=time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def track_in_progress(gauge: Gauge, *labels: str) -> Callable:
+    """Decorator counting an async handler in a gauge while it runs"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            with gauge.track(*labels):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def record_cache(cache: str, hits: int = 0, misses: int = 0):
+    if hits:
+        cache_requests.inc(cache, "hit", amount=hits)
+    if misses:
+        cache_requests.inc(cache, "miss", amount=misses)
+
+
+# Path template per endpoint function, filled in as routes are first hit
+_route_templates: Dict[Callable, str] = {}
+
+
+def route_template(scope) -> str:
+    """
+    Path template of the route that handled a request (e.g. /api/algorithms/{algorithm_id})
+    Only valid once the router has run; unmatched paths share one name
+    """
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    template = _route_templates.get(endpoint)
+    if template is None:
+        template = "unmatched"
+        for route in scope["app"].routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                template = route.path
+                break
+        _route_templates[endpoint] = template
+    return template
+
+
+def preload_route_templates(app):
+    """Resolve every route's path template up front instead of on its first request"""
+    for route in app.routes:
+        endpoint = getattr(route, "endpoint", None)
+        if endpoint is not None:
+            _route_templates.setdefault(endpoint, route.path)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording per-route latency, sizes and status codes
+
+    Routes are labelled by their path template so label cardinality stays bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        state = {"status": 500, "request_bytes": 0, "response_bytes": 0}
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                state["request_bytes"] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                state["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                state["response_bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        http_in_flight.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, counting_receive, counting_send)
+        finally:
+            duration = time.perf_counter() - start
+            http_in_flight.dec()
+            method = scope["method"]
+            route = route_template(scope)
+            http_requests.inc(method, route, str(state["status"]))
+            http_latency.observe(method, route, value=duration)
+            http_request_size.observe(method, route, value=state["request_bytes"])
+            http_response_size.observe(method, route, value=state["response_bytes"])
+
+
+class LoopLagSampler:
+    """Background task measuring how late the event loop runs a timed wakeup"""
+
+    def __init__(self, interval: float = LOOP_LAG_INTERVAL):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            loop_lag.observe(value=max(loop.time() - expected, 0.0))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+loop_lag_sampler = LoopLagSampler()
@@ -0,0 +1,11 @@
+"""
+Query Parameters
+Parsing helpers shared by routes that take list-valued query parameters
+"""
+
+from typing import List, Optional
+
+
+def split_values(values: Optional[List[str]]) -> List[str]:
+    """Accept both repeated query parameters and comma-separated lists"""
+    return [item.strip() for value in values or [] for item in value.split(",") if item.strip()]
@@ -0,0 +1,205 @@
+"""
+Request Profiling
+Opt-in per-request profiling, triggered by an admin header or a sampling
+rate, with profiles written to a size-capped local directory
+"""
+
+from collections import Counter as FrameCounter
+from datetime import datetime
+from typing import Optional
+import asyncio
+import cProfile
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+
+from services.metrics import route_template
+
+logger = logging.getLogger(__name__)
+
+# Fraction of requests profiled at random (0 disables sampling)
+SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+
+# Requests carrying this value in the X-Profile header are always profiled (unset disables)
+ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN", "")
+
+# 'sample' writes folded stacks (*.folded) for flamegraph tools; 'cprofile' writes
+# binary pstats (*.prof) for pstats/snakeviz, which cannot be turned into a flamegraph
+# because pstats keeps caller/callee pairs rather than whole stacks. cProfile only
+# sees the thread that enabled it, so sync (def) handlers running in the threadpool
+# are visible in 'sample' mode only
+MODE = os.getenv("PROFILE_MODE", "sample")
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", os.path.join(os.path.dirname(__file__), '..', 'data', 'profiles'))
+
+# Oldest profiles are deleted once the directory grows past this
+MAX_BYTES = int(os.getenv("PROFILE_MAX_BYTES", str(100 * 1024 * 1024)))
+
+# Seconds between stack samples in 'sample' mode
+SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.002"))
+
+PROFILE_HEADER = b"x-profile"
+
+# Threads other than the event loop are sampled only while running code from here
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + os.sep
+
+
+def frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{code.co_firstlineno}"
+
+
+class StackSampler:
+    """
+    Samples thread stacks at a fixed interval and counts identical stacks
+
+    The event loop thread is always sampled. Sync handlers run in the
+    threadpool, so every other thread is sampled too whenever it is running
+    application code; idle workers are skipped. Each stack is rooted at its
+    thread name. Output is the 'folded' format (frames joined by ';' and a
+    count), readable by flamegraph.pl, inferno and speedscope.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: FrameCounter = FrameCounter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                in_app = thread_id == self.thread_id
+                while frame is not None:
+                    stack.append(frame_name(frame))
+                    in_app = in_app or frame.f_code.co_filename.startswith(APP_DIR)
+                    frame = frame.f_back
+                if stack and in_app:
+                    stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                    self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def profile_filename(method: str, route: str, duration: float, extension: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    timestamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    return f"{timestamp}_{method}_{slug}_{duration * 1000:.0f}ms.{extension}"
+
+
+def enforce_disk_cap(directory: str, max_bytes: int, keep: str = ""):
+    """Delete the oldest profiles until the directory fits in max_bytes, sparing 'keep'"""
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and entry.path != keep:
+            stat = entry.stat()
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+    total = sum(size for _, size, _ in entries) + (os.path.getsize(keep) if keep else 0)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles selected requests
+
+    A request is profiled when its X-Profile header matches PROFILE_ADMIN_TOKEN,
+    or at random with probability PROFILE_SAMPLE_RATE. Only one request per
+    process is profiled at a time. Samples cover the event loop thread and any
+    thread running application code, so other requests interleaved on the loop
+    or running in the threadpool at the same time show up in them too. Only
+    'sample' mode produces flamegraph input and sees sync handlers; 'cprofile'
+    files are per-function stats for the event loop thread.
+    """
+
+    def __init__(self, app, sample_rate: float = SAMPLE_RATE, admin_token: str = ADMIN_TOKEN,
+                 mode: str = MODE, directory: str = PROFILE_DIR, max_bytes: int = MAX_BYTES):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.admin_token = admin_token.encode("latin-1")
+        self.mode = mode
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._active = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or bool(self.admin_token)
+
+    def should_profile(self, scope) -> bool:
+        if self.admin_token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_HEADER:
+                    return value == self.admin_token
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.enabled or not self.should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+        if not self._active.acquire(blocking=False):
+            # Another request is being profiled
+            await self.app(scope, receive, send)
+            return
+
+        profiler: Optional[cProfile.Profile] = None
+        sampler: Optional[StackSampler] = None
+        start = time.perf_counter()
+        try:
+            if self.mode == "cprofile":
+                profiler = cProfile.Profile()
+                profiler.enable()
+            else:
+                sampler = StackSampler(threading.get_ident())
+                sampler.start()
+            await self.app(scope, receive, send)
+        finally:
+            duration = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+            if sampler is not None:
+                sampler.stop()
+            self._active.release()
+            try:
+                await asyncio.to_thread(
+                    self.write, scope["method"], route_template(scope), duration, profiler, sampler
+                )
+            except Exception as e:
+                logger.error(f"Failed to write profile: {e}")
+
+    def write(self, method: str, route: str, duration: float,
+              profiler: Optional[cProfile.Profile], sampler: Optional[StackSampler]):
+        os.makedirs(self.directory, exist_ok=True)
+        extension = "prof" if profiler is not None else "folded"
+        path = os.path.join(self.directory, profile_filename(method, route, duration, extension))
+        if profiler is not None:
+            profiler.dump_stats(path)
+        else:
+            with open(path, "w") as f:
+                f.write(sampler.folded())
+        enforce_disk_cap(self.directory, self.max_bytes, keep=path)
+        logger.info(f"Profiled {method} {route} in {duration * 1000:.1f}ms -> {path}")
@@ -0,0 +1,245 @@
+"""
+Realtime
+Per-student WebSocket connections and server-pushed learning path updates
+"""
+
+from typing import Dict, List, Optional, Any, Set, Tuple
+from uuid import uuid4
+import asyncio
+import json
+import os
+import threading
+import time
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from services.metrics import websocket_connections, websocket_messages
+from services.store import store
+
+# Pushes queued per connection before a slow client is disconnected
+OUTBOX_SIZE = 256
+
+# Client messages handled together and acknowledged in one reply
+MAX_BATCH_MESSAGES = 100
+
+# Client messages buffered before the socket stops being read
+INBOX_SIZE = 2 * MAX_BATCH_MESSAGES
+
+# A student's tabs can land on different worker processes (API_WORKERS or
+# uvicorn --workers), so pushes are relayed through the shared store. Only
+# students connected on another worker are relayed (set to 0 to disable)
+RELAY = os.getenv("REALTIME_RELAY", "1") != "0"
+
+# Seconds between relay polls
+RELAY_INTERVAL = float(os.getenv("REALTIME_RELAY_INTERVAL", "0.25"))
+
+# Seconds a worker's presence rows outlive its last heartbeat (covers crashed workers)
+PRESENCE_TTL = 30.0
+
+
+class Connection:
+    """
+    One student WebSocket
+
+    Outgoing messages go through a bounded queue drained by a sender task,
+    so publishing never waits on a slow client. Incoming messages go through
+    a bounded queue too, so a client sending faster than its batches are
+    handled is held back by TCP flow control instead of filling memory.
+    """
+
+    def __init__(self, websocket: WebSocket, student_id: str):
+        self.websocket = websocket
+        self.student_id = student_id
+        self.outbox: "asyncio.Queue[Optional[Dict[str, Any]]]" = asyncio.Queue(maxsize=OUTBOX_SIZE)
+        self.inbox: "asyncio.Queue[Optional[str]]" = asyncio.Queue(maxsize=INBOX_SIZE)
+
+    def push(self, message: Dict[str, Any]) -> bool:
+        """Queue a message; False if the client has fallen too far behind"""
+        try:
+            self.outbox.put_nowait(message)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def abort(self):
+        """Drop queued pushes and close the socket"""
+        while not self.outbox.empty():
+            self.outbox.get_nowait()
+        self.outbox.put_nowait(None)
+
+    async def send_loop(self):
+        while True:
+            message = await self.outbox.get()
+            if message is None:
+                await self.websocket.close(code=1013)
+                return
+            await self.websocket.send_text(json.dumps(message, default=str))
+            websocket_messages.inc("out")
+
+    async def receive_loop(self):
+        """Read client frames into the inbox, pausing while it is full; None marks the end of the stream"""
+        cancelled = False
+        try:
+            while True:
+                message = await self.websocket.receive_text()
+                websocket_messages.inc("in")
+                await self.inbox.put(message)
+        except WebSocketDisconnect:
+            pass
+        except asyncio.CancelledError:
+            # Only cancelled once the handler has stopped reading the inbox
+            cancelled = True
+            raise
+        finally:
+            if not cancelled:
+                await self.inbox.put(None)
+
+    async def next_batch(self) -> Optional[List[str]]:
+        """
+        Wait for a client message, then take whatever else has already arrived
+        Batches grow on their own while the previous batch is being handled
+        """
+        first = await self.inbox.get()
+        if first is None:
+            return None
+        batch = [first]
+        while len(batch) < MAX_BATCH_MESSAGES and not self.inbox.empty():
+            message = self.inbox.get_nowait()
+            if message is None:
+                # Just taken, so there is room to put it back
+                self.inbox.put_nowait(None)
+                break
+            batch.append(message)
+        return batch
+
+
+class RealtimeHub:
+    """
+    Routes pushes to every connection a student has open
+
+    With the relay on, each worker records which students it holds
+    connections for in the store's presence table and polls it along with
+    the event log. Pushes are only written to the log for students present
+    on another worker, and they are appended in one batch per poll, so
+    writes for students nobody is watching cost nothing extra.
+    """
+
+    def __init__(self, relay: bool = RELAY, relay_interval: float = RELAY_INTERVAL):
+        self.relay = relay
+        self.relay_interval = relay_interval
+        self.origin = uuid4().hex
+        self._connections: Dict[str, Set[Connection]] = {}
+        self._remote: Set[str] = set()
+        self._pending: List[Tuple[str, Dict[str, Any]]] = []
+        self._pending_lock = threading.Lock()
+        self._presence_changed = False
+        self._presence_due = 0.0
+        self._relay_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def connect(self, connection: Connection):
+        if connection.student_id not in self._connections:
+            self._presence_changed = True
+        self._connections.setdefault(connection.student_id, set()).add(connection)
+        websocket_connections.inc()
+
+    def disconnect(self, connection: Connection):
+        connections = self._connections.get(connection.student_id)
+        if connections is not None and connection in connections:
+            connections.discard(connection)
+            if not connections:
+                del self._connections[connection.student_id]
+                self._presence_changed = True
+            websocket_connections.dec()
+
+    def listening(self, student_id: str) -> bool:
+        """Whether a push for this student could reach anyone, on this worker or another"""
+        return student_id in self._connections or student_id in self._remote
+
+    def publish(self, student_id: str, message: Dict[str, Any], source: Optional[Connection] = None):
+        """
+        Push a message to a student's connections, except the one it came from
+        Safe to call from threadpool handlers: delivery is handed to the event loop
+        """
+        if self._loop is not None and not self._on_loop():
+            self._loop.call_soon_threadsafe(self._deliver, student_id, message, source)
+        else:
+            self._deliver(student_id, message, source)
+        if student_id in self._remote:
+            with self._pending_lock:
+                self._pending.append((student_id, message))
+
+    def _on_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _deliver(self, student_id: str, message: Dict[str, Any], source: Optional[Connection] = None):
+        for connection in list(self._connections.get(student_id, ())):
+            if connection is not source and not connection.push(message):
+                # Too far behind to catch up; close it and let the client reconnect
+                self.disconnect(connection)
+                connection.abort()
+
+    def _take_pending(self) -> List[Tuple[str, Dict[str, Any]]]:
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        return pending
+
+    def _relay_sync(self, last_id: Optional[int], present: Optional[List[str]]) -> Tuple[int, List[Tuple[str, Dict[str, Any]]]]:
+        """One relay round against the store, run in a worker thread"""
+        pending = self._take_pending()
+        if pending:
+            store.append_events(self.origin, pending)
+        if present is not None:
+            store.set_presence(self.origin, present, PRESENCE_TTL)
+        self._remote = store.remote_presence(self.origin)
+        return store.events_since(last_id, self.origin)
+
+    async def _relay_loop(self):
+        last_id: Optional[int] = None
+        while True:
+            # Students are listed on the loop, where connections change
+            present = None
+            now = time.monotonic()
+            if self._presence_changed or (self._connections and now >= self._presence_due):
+                present = list(self._connections)
+                self._presence_changed = False
+                self._presence_due = now + PRESENCE_TTL / 3
+            try:
+                last_id, events = await asyncio.to_thread(self._relay_sync, last_id, present)
+            except Exception as e:
+                print(f"Error relaying realtime events: {e}")
+                if present is not None:
+                    self._presence_changed = True
+            else:
+                for student_id, message in events:
+                    self._deliver(student_id, message)
+            await asyncio.sleep(self.relay_interval)
+
+    def start(self):
+        self._loop = asyncio.get_running_loop()
+        if self.relay and self._relay_task is None:
+            self._relay_task = self._loop.create_task(self._relay_loop())
+
+    async def stop(self):
+        if self._relay_task is not None:
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except asyncio.CancelledError:
+                pass
+            self._relay_task = None
+            try:
+                # Hand over queued pushes and stop being counted as present
+                pending = self._take_pending()
+                if pending:
+                    await asyncio.to_thread(store.append_events, self.origin, pending)
+                await asyncio.to_thread(store.set_presence, self.origin, [], PRESENCE_TTL)
+            except Exception as e:
+                print(f"Error relaying realtime events: {e}")
+
+
+# Shared hub for the learning path routes
+hub = RealtimeHub()
@@ -0,0 +1,359 @@
+"""
+Recommendations
+Prerequisite graph and next-step recommendations for students, computed on
+the server from stored progress
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+import json
+import threading
+
+from services.caching import LRUCache
+from services.metrics import record_cache
+
+# Algorithm metadata and prerequisites, mirrored from frontend/src/config/algorithms.ts
+GRAPH_PATH = Path(__file__).parent.parent.parent.parent / "content" / "learning_path.json"
+
+DIFFICULTY_LEVELS = ("Beginner", "Intermediate", "Advanced")
+
+COMPLETED_STATUSES = ("completed", "mastered")
+
+# Performance thresholds, same as the frontend RecommendationEngine
+HIGH_PERFORMANCE_TIME = 0.7   # Complete in < 70% of estimated time
+LOW_PERFORMANCE_TIME = 1.5    # Complete in > 150% of estimated time
+HIGH_ACCURACY_RATE = 0.9      # 90% challenge success rate
+LOW_ACCURACY_RATE = 0.5       # 50% challenge success rate
+
+# Students whose recommendations are kept in memory
+MEMO_SIZE = 10000
+
+
+def challenge_success_rate(attempts: List[Dict[str, Any]]) -> float:
+    if not attempts:
+        return 0.0
+    return sum(1 for a in attempts if a.get("correct")) / len(attempts)
+
+
+class PrerequisiteGraph:
+    """
+    Compiled prerequisite DAG
+
+    Algorithms are numbered in topological order and every prerequisite set
+    (direct and transitive) is stored as a bitmask, so checking a student's
+    unlocks is a few integer operations per algorithm.
+    """
+
+    def __init__(self, algorithms: List[Dict[str, Any]]):
+        by_id = {algo["id"]: algo for algo in algorithms}
+        for algo in algorithms:
+            if algo["difficulty"] not in DIFFICULTY_LEVELS:
+                raise ValueError(f"Invalid difficulty {algo['difficulty']} for {algo['id']}")
+            for prereq_id in algo["prerequisites"]:
+                if prereq_id not in by_id:
+                    raise ValueError(f"Invalid prerequisite {prereq_id} for {algo['id']}")
+
+        self.order = self._topological_order(algorithms)
+        self.index = {algo_id: i for i, algo_id in enumerate(self.order)}
+        self.algorithms = [by_id[algo_id] for algo_id in self.order]
+
+        # Config order, which the frontend uses for level-by-level suggestions
+        self.config_order = [algo["id"] for algo in algorithms]
+        self.by_difficulty = {
+            level: [algo["id"] for algo in algorithms if algo["difficulty"] == level]
+            for level in DIFFICULTY_LEVELS
+        }
+
+        self.prerequisite_masks: List[int] = []
+        self.ancestor_masks: List[int] = []
+        for algo in self.algorithms:
+            direct = 0
+            ancestors = 0
+            for prereq_id in algo["prerequisites"]:
+                i = self.index[prereq_id]
+                direct |= 1 << i
+                # Prerequisites come earlier in topological order, so their closures are done
+                ancestors |= (1 << i) | self.ancestor_masks[i]
+            self.prerequisite_masks.append(direct)
+            self.ancestor_masks.append(ancestors)
+
+        self.level_masks = {
+            level: self.mask(self.by_difficulty[level]) for level in DIFFICULTY_LEVELS
+        }
+
+    @staticmethod
+    def _topological_order(algorithms: List[Dict[str, Any]]) -> List[str]:
+        """Kahn's algorithm, keeping config order among algorithms that are ready together"""
+        remaining = {algo["id"]: set(algo["prerequisites"]) for algo in algorithms}
+        order: List[str] = []
+        while remaining:
+            ready = [algo["id"] for algo in algorithms if algo["id"] in remaining and not remaining[algo["id"]]]
+            if not ready:
+                raise ValueError(f"Circular dependency among {sorted(remaining)}")
+            for algo_id in ready:
+                del remaining[algo_id]
+            for prereqs in remaining.values():
+                prereqs.difference_update(ready)
+            order.extend(ready)
+        return order
+
+    def mask(self, algorithm_ids: List[str]) -> int:
+        result = 0
+        for algo_id in algorithm_ids:
+            i = self.index.get(algo_id)
+            if i is not None:
+                result |= 1 << i
+        return result
+
+    def ids(self, mask: int) -> List[str]:
+        """Algorithm IDs in a mask, in topological order"""
+        return [algo_id for i, algo_id in enumerate(self.order) if mask >> i & 1]
+
+    def is_unlocked(self, algorithm_id: str, completed: int) -> bool:
+        return self.prerequisite_masks[self.index[algorithm_id]] & ~completed == 0
+
+    def get(self, algorithm_id: str) -> Dict[str, Any]:
+        return self.algorithms[self.index[algorithm_id]]
+
+
+class RecommendationEngine:
+    """
+    Server-side port of the frontend Recommendation and Prerequisite engines
+
+    The graph is compiled once per process. Results are memoized per student
+    and reused until that student's algorithm progress changes.
+    """
+
+    def __init__(self, graph_path: Path = GRAPH_PATH, memo_size: int = MEMO_SIZE):
+        self.graph_path = graph_path
+        self._graph: Optional[PrerequisiteGraph] = None
+        self._memo = LRUCache(memo_size)
+        self._lock = threading.Lock()
+
+    @property
+    def graph(self) -> PrerequisiteGraph:
+        if self._graph is None:
+            self.load()
+        return self._graph
+
+    def load(self):
+        """Compile the prerequisite graph and drop memoized results"""
+        with open(self.graph_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        graph = PrerequisiteGraph(data["algorithms"])
+        with self._lock:
+            self._graph = graph
+            self._memo.clear()
+
+    def recommend(self, student_id: str, progress: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Recommendations for a student, from the memo when their progress is unchanged"""
+        algorithm_progress = (progress or {}).get("algorithmProgress") or {}
+        entry = self._memo.get(student_id)
+        if entry is not None and (entry[0] is algorithm_progress or entry[0] == algorithm_progress):
+            record_cache("recommendations", hits=1)
+            return entry[1]
+
+        record_cache("recommendations", misses=1)
+        result = self.compute(algorithm_progress)
+        self._memo.put(student_id, (algorithm_progress, result))
+        return result
+
+    # Computation
+    def compute(self, algorithm_progress: Dict[str, Any]) -> Dict[str, Any]:
+        graph = self.graph
+        known = [(algo_id, p) for algo_id, p in algorithm_progress.items()
+                 if algo_id in graph.index and isinstance(p, dict)]
+        status = {algo_id: p.get("status", "not_started") for algo_id, p in known}
+        completed = graph.mask([algo_id for algo_id, s in status.items() if s in COMPLETED_STATUSES])
+
+        unlocked = [algo_id for algo_id in graph.config_order if graph.is_unlocked(algo_id, completed)]
+        locked = {}
+        for algo_id in graph.config_order:
+            if graph.is_unlocked(algo_id, completed):
+                continue
+            i = graph.index[algo_id]
+            missing = graph.ids(graph.prerequisite_masks[i] & ~completed)
+            locked[algo_id] = {
+                "missingPrerequisites": missing,
+                # Everything still to finish, transitively, in an order that can be followed
+                "path": graph.ids(graph.ancestor_masks[i] & ~completed),
+                "reason": (
+                    f"Complete {graph.get(missing[0])['name']} to unlock this algorithm"
+                    if len(missing) == 1 else
+                    f"Complete {len(missing)} prerequisite algorithms to unlock"
+                )
+            }
+
+        recommended_difficulty = self._recommended_difficulty(completed)
+        return {
+            "next": self._next_recommendation(known, status, completed, recommended_difficulty),
+            "suggested": self._suggested(unlocked, status),
+            "unlocked": unlocked,
+            "locked": locked,
+            "recommendedDifficulty": recommended_difficulty,
+            "difficultyCompletion": {
+                level: self._level_completion(level, completed) for level in DIFFICULTY_LEVELS
+            },
+            "performanceScores": {algo_id: self._performance_score(algo_id, p) for algo_id, p in known},
+            "adaptiveDifficulty": self._adaptive_difficulty(known, status),
+        }
+
+    def _recommended_difficulty(self, completed: int) -> str:
+        for level in DIFFICULTY_LEVELS[:-1]:
+            if self.graph.level_masks[level] & ~completed:
+                return level
+        return DIFFICULTY_LEVELS[-1]
+
+    def _level_completion(self, level: str, completed: int) -> int:
+        total = len(self.graph.by_difficulty[level])
+        if total == 0:
+            return 0
+        done = bin(self.graph.level_masks[level] & completed).count("1")
+        return round(done / total * 100)
+
+    def _next_recommendation(self, known: List[Tuple[str, Dict[str, Any]]], status: Dict[str, str],
+                             completed: int, current_level: str) -> Dict[str, Any]:
+        graph = self.graph
+
+        # Priority 1: Continue in-progress algorithm
+        in_progress = [(p.get("lastAccessedDate") or "", algo_id) for algo_id, p in known
+                       if p.get("status") == "in_progress"]
+        if in_progress:
+            algo_id = max(in_progress, key=lambda item: str(item[0]))[1]
+            return {
+                "type": "algorithm",
+                "algorithmId": algo_id,
+                "reason": f"Continue where you left off with {graph.get(algo_id)['name']}",
+                "priority": "high"
+            }
+
+        # Priority 2: Complete remaining algorithms in current difficulty level
+        for algo_id in graph.by_difficulty[current_level]:
+            if status.get(algo_id, "not_started") == "not_started" and graph.is_unlocked(algo_id, completed):
+                return {
+                    "type": "algorithm",
+                    "algorithmId": algo_id,
+                    "reason": f"Continue mastering {current_level} level with {graph.get(algo_id)['name']}",
+                    "priority": "high"
+                }
+
+        # Priority 3: Attempt practice challenge for completed algorithms
+        for algo_id, p in known:
+            if p.get("status") == "completed" and not p.get("challengeCompleted"):
+                return {
+                    "type": "challenge",
+                    "algorithmId": algo_id,
+                    "challengeId": f"{algo_id}_challenge",
+                    "reason": f"Master {graph.get(algo_id)['name']} by completing the practice challenge",
+                    "priority": "medium"
+                }
+
+        # Priority 4: Unlock next difficulty level
+        level_index = DIFFICULTY_LEVELS.index(current_level)
+        if not graph.level_masks[current_level] & ~completed and level_index + 1 < len(DIFFICULTY_LEVELS):
+            next_level = DIFFICULTY_LEVELS[level_index + 1]
+            if graph.by_difficulty[next_level]:
+                algo_id = graph.by_difficulty[next_level][0]
+                return {
+                    "type": "algorithm",
+                    "algorithmId": algo_id,
+                    "reason": f"Advance to {next_level} level with {graph.get(algo_id)['name']}",
+                    "priority": "high"
+                }
+
+        # Priority 5: Review algorithms with low performance
+        for algo_id, p in known:
+            attempts = p.get("challengeAttempts") or []
+            if attempts and challenge_success_rate(attempts) < LOW_ACCURACY_RATE:
+                return {
+                    "type": "review",
+                    "algorithmId": algo_id,
+                    "reason": f"Review {graph.get(algo_id)['name']} to strengthen your understanding",
+                    "priority": "low"
+                }
+
+        # Default: Start with first beginner algorithm
+        algo_id = graph.by_difficulty[DIFFICULTY_LEVELS[0]][0]
+        return {
+            "type": "algorithm",
+            "algorithmId": algo_id,
+            "reason": f"Start your ML journey with {graph.get(algo_id)['name']}",
+            "priority": "high"
+        }
+
+    def _suggested(self, unlocked: List[str], status: Dict[str, str], count: int = 3) -> List[str]:
+        available = [algo_id for algo_id in unlocked
+                     if status.get(algo_id, "not_started") in ("not_started", "in_progress")]
+        available.sort(key=lambda algo_id: DIFFICULTY_LEVELS.index(self.graph.get(algo_id)["difficulty"]))
+        return available[:count]
+
+    def _performance_score(self, algorithm_id: str, algo_progress: Dict[str, Any]) -> int:
+        """Performance score for an algorithm (0-100)"""
+        score = 0
+
+        # Completion score (40 points)
+        if algo_progress.get("status") in COMPLETED_STATUSES:
+            score += 40
+        elif algo_progress.get("status") == "in_progress":
+            score += 20
+
+        # Time efficiency score (30 points)
+        time_spent = algo_progress.get("timeSpent") or 0
+        if time_spent > 0:
+            time_ratio = time_spent / self.graph.get(algorithm_id)["estimatedTime"]
+            if time_ratio < HIGH_PERFORMANCE_TIME:
+                score += 30
+            elif time_ratio < 1.0:
+                score += 20
+            elif time_ratio < LOW_PERFORMANCE_TIME:
+                score += 10
+
+        # Challenge accuracy score (30 points)
+        attempts = algo_progress.get("challengeAttempts") or []
+        if attempts:
+            score += round(challenge_success_rate(attempts) * 30)
+
+        return min(100, score)
+
+    def _adaptive_difficulty(self, known: List[Tuple[str, Dict[str, Any]]], status: Dict[str, str]) -> Dict[str, str]:
+        finished = [(algo_id, p) for algo_id, p in known if status[algo_id] in COMPLETED_STATUSES]
+
+        if len(finished) >= 3:
+            time_ratios = [(p.get("timeSpent") or 0) / self.graph.get(algo_id)["estimatedTime"]
+                           for algo_id, p in finished]
+            success_rates = [challenge_success_rate(p.get("challengeAttempts") or []) for _, p in finished]
+            if (sum(time_ratios) / len(finished) < HIGH_PERFORMANCE_TIME
+                    and sum(success_rates) / len(finished) > HIGH_ACCURACY_RATE):
+                return {
+                    "suggestion": "harder",
+                    "reason": "Your performance is excellent! Consider exploring advanced topics."
+                }
+
+        if len(finished) < 2:
+            return {
+                "suggestion": "current",
+                "reason": "Continue at your current pace to build a strong foundation."
+            }
+
+        # Check for struggling indicators
+        struggling = 0
+        for algo_id, p in finished:
+            if (p.get("timeSpent") or 0) / self.graph.get(algo_id)["estimatedTime"] > LOW_PERFORMANCE_TIME:
+                struggling += 1
+            attempts = p.get("challengeAttempts") or []
+            if attempts and challenge_success_rate(attempts) < LOW_ACCURACY_RATE:
+                struggling += 1
+
+        if struggling >= len(finished) / 2:
+            return {
+                "suggestion": "easier",
+                "reason": "Consider reviewing prerequisite concepts to strengthen your foundation."
+            }
+        return {
+            "suggestion": "current",
+            "reason": "You're making steady progress. Keep up the good work!"
+        }
+
+
+# Shared engine for the learning path routes
+recommendations = RecommendationEngine()
@@ -0,0 +1,100 @@
+"""
+Startup
+Warmup phase run after the app starts and before it reports ready, so the
+first requests after a deploy do not pay for imports and content loading
+"""
+
+from typing import Callable, Dict, List, Optional, Any, Tuple
+import asyncio
+import logging
+import os
+import time
+
+from services.metrics import app_ready, startup_step_duration
+
+logger = logging.getLogger(__name__)
+
+# Set to 0 to report ready immediately and load everything on first use
+WARMUP_ENABLED = os.getenv("STARTUP_WARMUP", "1") != "0"
+
+
+class Warmup:
+    """
+    Ordered warmup steps and the readiness state derived from them
+
+    Steps run one at a time in a worker thread, so /health keeps answering
+    while they run. A failing step is logged and reported but does not block
+    readiness: whatever it would have loaded is loaded on first use instead.
+    """
+
+    def __init__(self, enabled: bool = WARMUP_ENABLED):
+        self.enabled = enabled
+        self._steps: List[Tuple[str, Callable[[], Any]]] = []
+        self._results: Dict[str, Dict[str, Any]] = {}
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._ready = False
+
+    def add(self, name: str, step: Callable[[], Any]):
+        self._steps.append((name, step))
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    async def _run(self):
+        for name, step in self._steps:
+            start = time.perf_counter()
+            try:
+                await asyncio.to_thread(step)
+                result: Dict[str, Any] = {"ok": True}
+            except Exception as e:
+                logger.error(f"Warmup step '{name}' failed: {e}")
+                result = {"ok": False, "error": str(e)}
+            duration = time.perf_counter() - start
+            result["seconds"] = round(duration, 4)
+            self._results[name] = result
+            startup_step_duration.set(name, value=duration)
+        self._finished_at = time.perf_counter()
+        logger.info(f"Warmup finished in {self._finished_at - self._started_at:.2f}s")
+        self._ready = True
+        app_ready.set(value=1)
+
+    def start(self):
+        """Begin warming up in the background (readiness follows when done)"""
+        if self._task is not None or self.ready:
+            return
+        self._started_at = time.perf_counter()
+        if not self.enabled:
+            self._finished_at = self._started_at
+            self._ready = True
+            app_ready.set(value=1)
+            return
+        app_ready.set(value=0)
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
+
+    def status(self) -> Dict[str, Any]:
+        finished = self._finished_at if self._finished_at is not None else time.perf_counter()
+        return {
+            "status": "ready" if self.ready else "warming",
+            "warmupEnabled": self.enabled,
+            "elapsedSeconds": round(finished - self._started_at, 4) if self._started_at is not None else 0.0,
+            "steps": {
+                name: self._results.get(name, {"ok": None})
+                for name, _ in self._steps
+            },
+        }
+
+
+# Shared warmup for the app
+warmup = Warmup()
@@ -0,0 +1,597 @@
+"""
+Learning Path Store
+Shared SQLite storage for progress, achievements, certificates and challenge
+submissions, safe to use from several uvicorn worker processes on one host
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterator, List, Optional, Any, Set, Tuple
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from services.analytics import SCHEMA as ANALYTICS_SCHEMA, rollups
+from services.metrics import record_cache, timed_storage
+
+# Data directory for persistence
+DATA_DIR = os.getenv("LEARNING_PATH_DATA_DIR", os.path.join(os.path.dirname(__file__), '..', 'data'))
+
+DB_PATH = os.getenv("LEARNING_PATH_DB", os.path.join(DATA_DIR, 'learning_path.db'))
+
+# Seconds a writer waits for another process to release the database lock
+BUSY_TIMEOUT = 10.0
+
+# Seconds realtime events are kept for other workers to pick up
+EVENT_RETENTION = 60.0
+
+# Bulk export format version, written in the header line
+EXPORT_VERSION = 1
+
+# Rows read per query while exporting; a cursor line follows each page
+EXPORT_PAGE_SIZE = 500
+
+# Record types in export order, with the query for one page of each (keyed by rowid)
+EXPORT_QUERIES = {
+    "progress": "SELECT rowid, student_id, data, updated_at FROM progress",
+    "achievement": "SELECT rowid, student_id, achievement_id, earned_date FROM achievements",
+    "certificate": "SELECT rowid, student_id, data FROM certificates",
+    "challenge_submission": "SELECT rowid, student_id, algorithm_id, data FROM challenge_submissions",
+    "challenge_served": "SELECT rowid, student_id, algorithm_id, challenge_id FROM challenges_served",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    student_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS achievements (
+    student_id TEXT NOT NULL,
+    achievement_id TEXT NOT NULL,
+    earned_date TEXT NOT NULL,
+    PRIMARY KEY (student_id, achievement_id)
+);
+CREATE TABLE IF NOT EXISTS certificates (
+    certificate_id TEXT PRIMARY KEY,
+    student_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_certificates_student ON certificates (student_id);
+CREATE TABLE IF NOT EXISTS challenge_submissions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id TEXT NOT NULL,
+    algorithm_id TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_submissions_student ON challenge_submissions (student_id, algorithm_id);
+CREATE TABLE IF NOT EXISTS challenges_served (
+    student_id TEXT NOT NULL,
+    algorithm_id TEXT NOT NULL,
+    challenge_id TEXT NOT NULL,
+    PRIMARY KEY (student_id, algorithm_id, challenge_id)
+);
+CREATE TABLE IF NOT EXISTS imports (
+    import_id TEXT PRIMARY KEY,
+    cursor INTEGER NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS realtime_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    data TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS realtime_presence (
+    origin TEXT NOT NULL,
+    student_id TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (origin, student_id)
+);
+"""
+
+
+def to_json(data: Any) -> str:
+    return json.dumps(data, default=str)
+
+
+def utc_timestamp(value: datetime) -> datetime:
+    """Timezone-aware UTC version of a timestamp; naive ones are taken as UTC"""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def placeholders(items: List[Any]) -> str:
+    return ", ".join("?" for _ in items)
+
+
+def parse_cursor(cursor: str) -> Tuple[str, int]:
+    """Split an export cursor ('<type>:<rowid>') into its parts"""
+    kind, _, rowid = cursor.partition(":")
+    if kind not in EXPORT_QUERIES or not rowid.isdigit():
+        raise ValueError(f"Invalid export cursor '{cursor}'")
+    return kind, int(rowid)
+
+
+def export_line(kind: str, row: tuple) -> bytes:
+    """One NDJSON record; stored JSON columns are spliced in without re-encoding"""
+    if kind == "progress":
+        _, student_id, data, updated_at = row
+        line = f'{{"type":"progress","studentId":{json.dumps(student_id)},"updatedAt":{json.dumps(updated_at)},"data":{data}}}'
+    elif kind == "achievement":
+        _, student_id, achievement_id, earned_date = row
+        line = json.dumps({"type": kind, "studentId": student_id, "achievementId": achievement_id,
+                           "earnedDate": earned_date})
+    elif kind == "certificate":
+        _, student_id, data = row
+        line = f'{{"type":"certificate","studentId":{json.dumps(student_id)},"data":{data}}}'
+    elif kind == "challenge_submission":
+        _, student_id, algorithm_id, data = row
+        line = (f'{{"type":"challenge_submission","studentId":{json.dumps(student_id)},'
+                f'"algorithmId":{json.dumps(algorithm_id)},"data":{data}}}')
+    else:
+        _, student_id, algorithm_id, challenge_id = row
+        line = json.dumps({"type": kind, "studentId": student_id, "algorithmId": algorithm_id,
+                           "challengeId": challenge_id})
+    return line.encode("utf-8") + b"\n"
+
+
+class LearningPathStore:
+    """
+    SQLite-backed learning path storage
+
+    The database runs in WAL mode so readers never block the single writer,
+    and every read-modify-write (sync merges, award dedupe) happens inside a
+    BEGIN IMMEDIATE transaction, so concurrent workers serialize on the
+    database lock instead of overwriting each other. Progress records are
+    cached in-process; the cache is dropped whenever SQLite's data_version
+    shows that another connection, in this process or another, committed.
+    """
+
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._cache_lock = threading.Lock()
+        self._progress_cache: Dict[str, Dict[str, Any]] = {}
+        # Bumped on every cache write or clear, so a read that raced one does not cache stale rows
+        self._cache_generation = 0
+        self._initialized = False
+
+    # Connections
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None,
+                                   check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.data_version = None
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Connection]:
+        """Write transaction that takes the database lock up front"""
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _reader(self) -> sqlite3.Connection:
+        """Connection for reads, dropping the progress cache if anyone else has written"""
+        conn = self._connection()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._local.data_version:
+            self._clear_progress_cache()
+            self._local.data_version = version
+        return conn
+
+    def _cache_progress(self, student_id: str, data: Dict[str, Any]):
+        """Cache a record just written by this process"""
+        with self._cache_lock:
+            self._progress_cache[student_id] = data
+            self._cache_generation += 1
+
+    def _clear_progress_cache(self):
+        with self._cache_lock:
+            self._progress_cache.clear()
+            self._cache_generation += 1
+
+    def initialize(self):
+        """Create tables and import legacy progress_*.json files"""
+        if self._initialized:
+            return
+        self._connection().executescript(SCHEMA + ANALYTICS_SCHEMA)
+        with self.transaction() as conn:
+            self._migrate_progress_files(conn)
+        self._initialized = True
+
+    def _migrate_progress_files(self, conn: sqlite3.Connection):
+        for file_path in glob.glob(os.path.join(DATA_DIR, 'progress_*.json')):
+            try:
+                with open(file_path, 'r') as f:
+                    data = json.load(f)
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO progress (student_id, data, updated_at) VALUES (?, ?, ?)",
+                    (data["studentId"], to_json(data), datetime.now().isoformat())
+                ).rowcount
+                if inserted:
+                    rollups.record_progress(conn, data["studentId"], data.get("algorithmProgress", {}), kind="seed")
+                os.replace(file_path, file_path + ".migrated")
+            except Exception as e:
+                print(f"Error migrating {file_path}: {e}")
+
+    # Progress
+    def load_progress(self, student_id: str) -> Optional[Dict[str, Any]]:
+        return self.load_progress_many([student_id])[student_id]
+
+    @timed_storage("load_progress_many")
+    def load_progress_many(self, student_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Progress for many students, one query for all cache misses"""
+        conn = self._reader()
+        with self._cache_lock:
+            results = {sid: self._progress_cache.get(sid) for sid in student_ids}
+            generation = self._cache_generation
+        missing = [sid for sid, data in results.items() if data is None]
+        record_cache("progress", hits=len(results) - len(missing), misses=len(missing))
+        if missing:
+            rows = conn.execute(
+                f"SELECT student_id, data FROM progress WHERE student_id IN ({placeholders(missing)})",
+                missing
+            ).fetchall()
+            loaded = {student_id: json.loads(data) for student_id, data in rows}
+            results.update(loaded)
+            with self._cache_lock:
+                # A write or clear since the cache lookup may have made these rows stale
+                if generation == self._cache_generation:
+                    for student_id, data in loaded.items():
+                        self._progress_cache.setdefault(student_id, data)
+        return results
+
+    def _put_progress(self, conn: sqlite3.Connection, student_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        serialized = to_json(data)
+        conn.execute(
+            "INSERT OR REPLACE INTO progress (student_id, data, updated_at) VALUES (?, ?, ?)",
+            (student_id, serialized, datetime.now().isoformat())
+        )
+        return json.loads(serialized)
+
+    @timed_storage("save_progress")
+    def save_progress(self, student_id: str, data: Dict[str, Any]):
+        with self.transaction() as conn:
+            stored = self._put_progress(conn, student_id, data)
+            rollups.record_progress(conn, student_id, data.get("algorithmProgress", {}), kind="save")
+        self._cache_progress(student_id, stored)
+
+    @timed_storage("sync_progress")
+    def sync_progress(self, student_id: str, updates: Dict[str, Any], timestamp: datetime) -> Optional[Dict[str, Any]]:
+        """
+        Merge progress updates if they are newer than what is stored (last write wins)
+        Returns None on success, or the stored record if it is newer
+        """
+        with self.transaction() as conn:
+            row = conn.execute("SELECT data FROM progress WHERE student_id = ?", (student_id,)).fetchone()
+            if row is None:
+                # No existing data, save new
+                merged = {
+                    "studentId": student_id,
+                    "algorithmProgress": updates,
+                    "lastSyncDate": timestamp.isoformat()
+                }
+            else:
+                existing = json.loads(row[0])
+                existing_timestamp = datetime.fromisoformat(existing.get("lastSyncDate", "2000-01-01T00:00:00"))
+                if utc_timestamp(timestamp) <= utc_timestamp(existing_timestamp):
+                    return existing
+                merged = existing
+                merged.setdefault("algorithmProgress", {}).update(updates)
+                merged["lastSyncDate"] = timestamp.isoformat()
+
+            stored = self._put_progress(conn, student_id, merged)
+            rollups.record_progress(conn, student_id, updates, kind="sync")
+        self._cache_progress(student_id, stored)
+        return None
+
+    # Achievements
+    def get_achievements(self, student_id: str) -> List[Dict[str, Any]]:
+        return self.get_achievements_many([student_id])[student_id]
+
+    @timed_storage("get_achievements_many")
+    def get_achievements_many(self, student_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        results: Dict[str, List[Dict[str, Any]]] = {sid: [] for sid in student_ids}
+        rows = self._reader().execute(
+            f"SELECT student_id, achievement_id, earned_date FROM achievements "
+            f"WHERE student_id IN ({placeholders(student_ids)}) ORDER BY rowid",
+            student_ids
+        )
+        for student_id, achievement_id, earned_date in rows:
+            results[student_id].append({"achievementId": achievement_id, "earnedDate": earned_date})
+        return results
+
+    @timed_storage("award_achievements")
+    def award_achievements(self, awards: List[Dict[str, str]]) -> List[bool]:
+        """
+        Award achievements in one transaction
+        Each award is {'studentId', 'achievementId', 'earnedDate'}; returns whether each was new
+        """
+        results = []
+        with self.transaction() as conn:
+            for award in awards:
+                inserted = conn.execute(
+                    "INSERT OR IGNORE INTO achievements (student_id, achievement_id, earned_date) VALUES (?, ?, ?)",
+                    (award["studentId"], award["achievementId"], award["earnedDate"])
+                ).rowcount
+                if inserted:
+                    rollups.record_achievement(conn, award["studentId"], award["achievementId"])
+                results.append(bool(inserted))
+        return results
+
+    # Certificates
+    @timed_storage("get_certificates_many")
+    def get_certificates_many(self, student_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        results: Dict[str, List[Dict[str, Any]]] = {sid: [] for sid in student_ids}
+        rows = self._reader().execute(
+            f"SELECT student_id, data FROM certificates WHERE student_id IN ({placeholders(student_ids)}) ORDER BY rowid",
+            student_ids
+        )
+        for student_id, data in rows:
+            results[student_id].append(json.loads(data))
+        return results
+
+    def get_certificates(self, student_id: str) -> List[Dict[str, Any]]:
+        return self.get_certificates_many([student_id])[student_id]
+
+    @timed_storage("get_certificate")
+    def get_certificate(self, certificate_id: str) -> Optional[Dict[str, Any]]:
+        row = self._reader().execute(
+            "SELECT data FROM certificates WHERE certificate_id = ?", (certificate_id,)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    @timed_storage("add_certificate")
+    def add_certificate(self, student_id: str, certificate: Dict[str, Any]):
+        with self.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO certificates (certificate_id, student_id, data) VALUES (?, ?, ?)",
+                (certificate["certificateId"], student_id, to_json(certificate))
+            )
+
+    # Challenges
+    @timed_storage("record_submissions")
+    def record_submissions(self, submissions: List[Dict[str, Any]]):
+        """Store graded challenge submissions in one transaction"""
+        with self.transaction() as conn:
+            for submission in submissions:
+                conn.execute(
+                    "INSERT INTO challenge_submissions (student_id, algorithm_id, data) VALUES (?, ?, ?)",
+                    (submission["studentId"], submission["algorithmId"], to_json(submission))
+                )
+                rollups.record_challenge(
+                    conn, submission["studentId"], submission["algorithmId"], submission["challengeId"],
+                    submission["correct"], submission["score"], submission["timeSpent"]
+                )
+
+    @timed_storage("challenge_history")
+    def challenge_history(self, student_id: str, algorithm_id: str) -> List[Dict[str, Any]]:
+        rows = self._reader().execute(
+            "SELECT data FROM challenge_submissions WHERE student_id = ? AND algorithm_id = ? ORDER BY id",
+            (student_id, algorithm_id)
+        )
+        return [json.loads(data) for (data,) in rows]
+
+    @timed_storage("serve_challenge")
+    def serve_challenge(self, student_id: str, algorithm_id: str,
+                        pick: Callable[[Set[str]], Tuple[Optional[Dict[str, Any]], bool]]) -> Optional[Dict[str, Any]]:
+        """
+        Pick a challenge from the student's served set and record it in one transaction
+        pick gets the challenge IDs served in the current round and returns
+        (challenge, new_round); concurrent requests for the same student
+        serialize on the write lock, so they never claim the same challenge
+        """
+        with self.transaction() as conn:
+            served = {
+                challenge_id for (challenge_id,) in conn.execute(
+                    "SELECT challenge_id FROM challenges_served WHERE student_id = ? AND algorithm_id = ?",
+                    (student_id, algorithm_id)
+                )
+            }
+            challenge, new_round = pick(served)
+            if challenge is None:
+                return None
+            if new_round:
+                conn.execute(
+                    "DELETE FROM challenges_served WHERE student_id = ? AND algorithm_id = ?",
+                    (student_id, algorithm_id)
+                )
+            conn.execute(
+                "INSERT INTO challenges_served (student_id, algorithm_id, challenge_id) VALUES (?, ?, ?)",
+                (student_id, algorithm_id, challenge["id"])
+            )
+        return challenge
+
+    # Bulk export and import
+    def export_ndjson(self, types: Optional[List[str]] = None, after: Optional[str] = None,
+                      page_size: int = EXPORT_PAGE_SIZE) -> Iterator[bytes]:
+        """
+        Stream every learning path record as NDJSON, one page of rows per chunk
+        
+        The export reads one consistent snapshot on its own connection, so it
+        never holds more than a page in memory and never blocks writers. A
+        {"type": "cursor"} line follows each page; pass its value as 'after'
+        to resume an interrupted export.
+        """
+        kinds = [kind for kind in EXPORT_QUERIES if types is None or kind in types]
+        start_kind, start_rowid = parse_cursor(after) if after else (None, 0)
+        conn = sqlite3.connect(self.db_path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False)
+        try:
+            conn.execute("BEGIN")
+            yield to_json({"type": "header", "version": EXPORT_VERSION, "types": kinds,
+                           "exportedAt": datetime.now().isoformat()}).encode("utf-8") + b"\n"
+            order = list(EXPORT_QUERIES)
+            for kind in kinds:
+                if start_kind is not None and order.index(kind) < order.index(start_kind):
+                    continue
+                last_rowid = start_rowid if kind == start_kind else 0
+                while True:
+                    rows = conn.execute(
+                        f"{EXPORT_QUERIES[kind]} WHERE rowid > ? ORDER BY rowid LIMIT ?", (last_rowid, page_size)
+                    ).fetchall()
+                    if not rows:
+                        break
+                    last_rowid = rows[-1][0]
+                    cursor = to_json({"type": "cursor", "cursor": f"{kind}:{last_rowid}"}).encode("utf-8")
+                    yield b"".join(export_line(kind, row) for row in rows) + cursor + b"\n"
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def import_cursor(self, import_id: str) -> int:
+        """Lines of an import already committed (0 for a new import)"""
+        row = self._connection().execute("SELECT cursor FROM imports WHERE import_id = ?", (import_id,)).fetchone()
+        return row[0] if row else 0
+
+    @timed_storage("import_records")
+    def import_records(self, records: List[Dict[str, Any]], import_id: Optional[str] = None,
+                       cursor: int = 0) -> Dict[str, int]:
+        """
+        Write a batch of exported records in one transaction
+        
+        Records are applied idempotently (progress and certificates are
+        replaced, duplicate achievements, served challenges and submissions
+        are skipped), so replaying a batch is harmless. With an import_id,
+        the cursor (lines consumed so far) is saved in the same transaction.
+        Returns counts of records written per type.
+        """
+        counts: Dict[str, int] = {}
+        with self.transaction() as conn:
+            for record in records:
+                if self._import_record(conn, record):
+                    counts[record["type"]] = counts.get(record["type"], 0) + 1
+            if import_id:
+                conn.execute(
+                    "INSERT OR REPLACE INTO imports (import_id, cursor, updated_at) VALUES (?, ?, ?)",
+                    (import_id, cursor, datetime.now().isoformat())
+                )
+        # Imported students bypassed the cache, so drop it
+        self._clear_progress_cache()
+        return counts
+
+    def _import_record(self, conn: sqlite3.Connection, record: Dict[str, Any]) -> bool:
+        kind = record["type"]
+        student_id = record["studentId"]
+        if kind == "progress":
+            data = record["data"]
+            conn.execute(
+                "INSERT OR REPLACE INTO progress (student_id, data, updated_at) VALUES (?, ?, ?)",
+                (student_id, to_json(data), record.get("updatedAt") or datetime.now().isoformat())
+            )
+            rollups.record_progress(conn, student_id, data.get("algorithmProgress", {}), kind="seed")
+            return True
+        if kind == "achievement":
+            inserted = conn.execute(
+                "INSERT OR IGNORE INTO achievements (student_id, achievement_id, earned_date) VALUES (?, ?, ?)",
+                (student_id, record["achievementId"], record["earnedDate"])
+            ).rowcount
+            if inserted:
+                rollups.record_achievement(conn, student_id, record["achievementId"], seed=True)
+            return bool(inserted)
+        if kind == "certificate":
+            conn.execute(
+                "INSERT OR REPLACE INTO certificates (certificate_id, student_id, data) VALUES (?, ?, ?)",
+                (record["data"]["certificateId"], student_id, to_json(record["data"]))
+            )
+            return True
+        if kind == "challenge_submission":
+            data = record["data"]
+            serialized = to_json(data)
+            exists = conn.execute(
+                "SELECT 1 FROM challenge_submissions WHERE student_id = ? AND algorithm_id = ? AND data = ?",
+                (student_id, record["algorithmId"], serialized)
+            ).fetchone()
+            if exists:
+                return False
+            conn.execute(
+                "INSERT INTO challenge_submissions (student_id, algorithm_id, data) VALUES (?, ?, ?)",
+                (student_id, record["algorithmId"], serialized)
+            )
+            if "correct" in data:
+                rollups.record_challenge(
+                    conn, student_id, record["algorithmId"], data.get("challengeId", ""),
+                    data["correct"], data.get("score", 0), data.get("timeSpent", 0), seed=True
+                )
+            return True
+        if kind == "challenge_served":
+            return bool(conn.execute(
+                "INSERT OR IGNORE INTO challenges_served (student_id, algorithm_id, challenge_id) VALUES (?, ?, ?)",
+                (student_id, record["algorithmId"], record["challengeId"])
+            ).rowcount)
+        raise ValueError(f"Unknown record type '{kind}'")
+
+    # Realtime events
+    @timed_storage("append_events")
+    def append_events(self, origin: str, events: List[Tuple[str, Dict[str, Any]]]):
+        """Queue (student_id, message) pushes for WebSocket connections held by other workers"""
+        now = time.time()
+        with self.transaction() as conn:
+            conn.executemany(
+                "INSERT INTO realtime_events (origin, student_id, data, created_at) VALUES (?, ?, ?, ?)",
+                [(origin, student_id, to_json(message), now) for student_id, message in events]
+            )
+            conn.execute("DELETE FROM realtime_events WHERE created_at < ?", (now - EVENT_RETENTION,))
+
+    @timed_storage("set_presence")
+    def set_presence(self, origin: str, student_ids: List[str], ttl: float):
+        """Replace the students with open WebSocket connections on one worker; rows expire after ttl seconds"""
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute("DELETE FROM realtime_presence WHERE origin = ? OR expires_at < ?", (origin, now))
+            conn.executemany(
+                "INSERT INTO realtime_presence (origin, student_id, expires_at) VALUES (?, ?, ?)",
+                [(origin, student_id, now + ttl) for student_id in student_ids]
+            )
+
+    @timed_storage("remote_presence")
+    def remote_presence(self, origin: str) -> Set[str]:
+        """Students with open WebSocket connections on other workers"""
+        rows = self._connection().execute(
+            "SELECT DISTINCT student_id FROM realtime_presence WHERE origin != ? AND expires_at >= ?",
+            (origin, time.time())
+        )
+        return {student_id for (student_id,) in rows}
+
+    @timed_storage("events_since")
+    def events_since(self, last_id: Optional[int], origin: str) -> Tuple[int, List[Tuple[str, Dict[str, Any]]]]:
+        """
+        Events from other origins after last_id
+        Returns the new last_id and (student_id, message) pairs; pass None to start from the newest event
+        """
+        conn = self._connection()
+        if last_id is None:
+            return conn.execute("SELECT COALESCE(MAX(id), 0) FROM realtime_events").fetchone()[0], []
+        rows = conn.execute(
+            "SELECT id, origin, student_id, data FROM realtime_events WHERE id > ? ORDER BY id", (last_id,)
+        ).fetchall()
+        if rows:
+            last_id = rows[-1][0]
+        return last_id, [(student_id, json.loads(data)) for _, event_origin, student_id, data in rows
+                         if event_origin != origin]
+
+    # Analytics
+    @timed_storage("analytics")
+    def analytics(self, algorithm_id: Optional[str] = None, challenge_id: Optional[str] = None,
+                  days: int = 30) -> Dict[str, Any]:
+        return rollups.snapshot(self._reader(), algorithm_id, challenge_id, days)
+
+
+# Shared store for all learning path routes
+store = LearningPathStore()
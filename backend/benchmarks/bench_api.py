@@ -0,0 +1,544 @@
+"""
+API Benchmark Suite
+Drives the FastAPI app in-process through an ASGI client and reports
+throughput and p50/p95/p99 latency for every route
+
+Usage (from backend/):
+    python benchmarks/bench_api.py
+    python benchmarks/bench_api.py --requests 500 --concurrency 20 --processes 4
+    python benchmarks/bench_api.py --output results.json --baseline baseline.json
+    python benchmarks/bench_api.py --only learning_path --save-baseline baseline.json
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import random
+import re
+import sys
+import tempfile
+import time
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+# Sizes chosen to look like real traffic rather than toy requests
+STUDENT_COUNT = 200
+EVALUATION_SIZE = 50_000
+ALGORITHM_IDS = [
+    "linear_regression", "logistic_regression", "knn", "kmeans", "naive_bayes",
+    "decision_tree", "svm", "ann", "cnn", "rnn", "transformer"
+]
+STATUSES = ["not_started", "in_progress", "completed", "mastered"]
+
+LONG_CODE = "\n".join(
+    [
+        "import numpy as np",
+        "rng = np.random.default_rng(0)",
+        "X = rng.normal(size=(500, 8))",
+        "w = rng.normal(size=8)",
+        "y = X @ w + rng.normal(scale=0.1, size=500)",
+    ]
+    + [
+        f"def step_{i}(theta, lr=0.01):\n"
+        f"    grad = X.T @ (X @ theta - y) / len(y)\n"
+        f"    return theta - lr * grad"
+        for i in range(40)
+    ]
+    + [
+        "theta = np.zeros(8)",
+        "for i in range(200):",
+        "    theta = step_0(theta)",
+        "print('loss', float(np.mean((X @ theta - y) ** 2)))",
+    ]
+)
+
+
+def student_id(i: int) -> str:
+    return f"bench_student_{i % STUDENT_COUNT:04d}"
+
+
+def channel_student_id(i: int) -> str:
+    """Students for WebSocket scenarios, distinct per load generator process"""
+    return f"bench_channel_{i:07d}"
+
+
+def progress_payload(i: int) -> Dict[str, Any]:
+    rng = random.Random(i)
+    return {
+        "studentId": student_id(i),
+        "algorithmProgress": {
+            algo: {
+                "algorithmId": algo,
+                "status": rng.choice(STATUSES),
+                "completionPercentage": rng.randint(0, 100),
+                "timeSpent": rng.randint(0, 300),
+                "challengeAttempts": [],
+                "challengeCompleted": False
+            }
+            for algo in ALGORITHM_IDS
+        },
+        "completedSteps": {algo: ["introduction", "mathematics"] for algo in ALGORITHM_IDS},
+        "onboardingComplete": True
+    }
+
+
+def import_payload(i: int) -> bytes:
+    """NDJSON body restoring progress for every bench student"""
+    return "".join(
+        json.dumps({"type": "progress", "studentId": student_id(j), "data": progress_payload(i * STUDENT_COUNT + j)}) + "\n"
+        for j in range(STUDENT_COUNT)
+    ).encode()
+
+
+def evaluation_payload(task_type: str) -> Dict[str, Any]:
+    rng = random.Random(42)
+    if task_type == "regression":
+        y_true = [rng.uniform(0, 100) for _ in range(EVALUATION_SIZE)]
+        y_pred = [v + rng.gauss(0, 5) for v in y_true]
+    else:
+        y_true = [rng.randint(0, 2) for _ in range(EVALUATION_SIZE)]
+        y_pred = [v if rng.random() < 0.8 else rng.randint(0, 2) for v in y_true]
+    return {"y_true": y_true, "y_pred": y_pred, "task_type": task_type}
+
+
+def submission_payload(i: int) -> Dict[str, Any]:
+    return {
+        "studentId": student_id(i),
+        "challengeId": "knn_challenge",
+        "algorithmId": "knn",
+        "selectedAnswer": "It becomes smoother and more generalized" if i % 3 else "It becomes linear",
+        "timeSpent": 10 + i % 120
+    }
+
+
+def channel_message(i: int) -> str:
+    rng = random.Random(i)
+    algo = ALGORITHM_IDS[i % len(ALGORITHM_IDS)]
+    return json.dumps({
+        "type": "progress",
+        "seq": i,
+        "updates": {algo: {"algorithmId": algo, "status": rng.choice(STATUSES), "timeSpent": rng.randint(0, 300)}},
+        "timestamp": f"2200-01-01T00:00:00.{i % 1_000_000:06d}"
+    })
+
+
+class ASGIWebSocket:
+    """Minimal in-process WebSocket client speaking ASGI directly to the app"""
+
+    def __init__(self, app, path: str):
+        self.app = app
+        self.path = path
+        self.to_app: asyncio.Queue = asyncio.Queue()
+        self.from_app: asyncio.Queue = asyncio.Queue()
+        self.task: Optional[asyncio.Task] = None
+
+    async def connect(self):
+        scope = {
+            "type": "websocket", "asgi": {"version": "3.0"}, "scheme": "ws", "path": self.path,
+            "raw_path": self.path.encode(), "root_path": "", "query_string": b"", "headers": [],
+            "server": ("bench", 80), "client": ("127.0.0.1", 50000), "subprotocols": [],
+        }
+        self.task = asyncio.create_task(self.app(scope, self.to_app.get, self.from_app.put))
+        await self.to_app.put({"type": "websocket.connect"})
+        message = await self.from_app.get()
+        if message["type"] != "websocket.accept":
+            raise RuntimeError(f"WebSocket {self.path} rejected: {message}")
+
+    async def send(self, text: str):
+        await self.to_app.put({"type": "websocket.receive", "text": text})
+
+    async def receive(self) -> Dict[str, Any]:
+        message = await self.from_app.get()
+        if message["type"] != "websocket.send":
+            raise RuntimeError(f"WebSocket {self.path} closed: {message}")
+        return json.loads(message["text"])
+
+    async def close(self):
+        await self.to_app.put({"type": "websocket.disconnect", "code": 1000})
+        await self.task
+
+
+class Scenario:
+    """
+    One benchmarked request shape: a method, a route and a payload factory
+    Method "WS" sends body(i) over a WebSocket and times the round trip to its ack
+    """
+
+    def __init__(self, name: str, method: str, route: str, path: Callable[[int], str],
+                 body: Optional[Callable[[int], Any]] = None, requests: Optional[int] = None):
+        self.name = name
+        self.method = method
+        self.route = route
+        self.path = path
+        self.body = body
+        self.requests = requests
+
+
+def build_scenarios() -> List[Scenario]:
+    regression = evaluation_payload("regression")
+    classification = evaluation_payload("classification")
+    students = [student_id(i) for i in range(STUDENT_COUNT)]
+    lp = "/api/learning-path"
+
+    return [
+        Scenario("health", "GET", "/health", lambda i: "/health"),
+        Scenario("ready", "GET", "/ready", lambda i: "/ready"),
+        Scenario("metrics", "GET", "/metrics", lambda i: "/metrics"),
+
+        # algorithms router
+        Scenario("algorithms.list", "GET", "/api/algorithms/list", lambda i: "/api/algorithms/list"),
+        Scenario("algorithms.get", "GET", "/api/algorithms/{algorithm_id}",
+                 lambda i: f"/api/algorithms/{ALGORITHM_IDS[i % len(ALGORITHM_IDS)]}"),
+        Scenario("algorithms.section", "GET", "/api/algorithms/{algorithm_id}/section/{section_name}",
+                 lambda i: f"/api/algorithms/{ALGORITHM_IDS[i % len(ALGORITHM_IDS)]}/section/introduction"),
+        Scenario("algorithms.compare", "GET", "/api/algorithms/{algorithm_id}/compare",
+                 lambda i: "/api/algorithms/linear_regression/compare?compare_with=logistic_regression"),
+        Scenario("algorithms.list.projected", "GET", "/api/algorithms/list",
+                 lambda i: "/api/algorithms/list?fields=id,name&select=/sections/introduction/learningType"),
+        Scenario("algorithms.get.projected", "GET", "/api/algorithms/{algorithm_id}",
+                 lambda i: f"/api/algorithms/{ALGORITHM_IDS[i % len(ALGORITHM_IDS)]}"
+                           f"?fields=id,name,difficulty&sections=mathematical_model"),
+        Scenario("algorithms.batch", "POST", "/api/algorithms/batch", lambda i: "/api/algorithms/batch",
+                 lambda i: {"ids": ALGORITHM_IDS, "select": ["/name", "/sections/introduction/strengths"]}),
+        Scenario("algorithms.categories", "GET", "/api/algorithms/categories/list",
+                 lambda i: "/api/algorithms/categories/list"),
+
+        # execution router
+        Scenario("execute.run", "POST", "/api/execute/run", lambda i: "/api/execute/run",
+                 lambda i: {"code": LONG_CODE}, requests=50),
+        Scenario("execute.evaluate.regression", "POST", "/api/execute/evaluate", lambda i: "/api/execute/evaluate",
+                 lambda i: regression, requests=50),
+        Scenario("execute.evaluate.classification", "POST", "/api/execute/evaluate", lambda i: "/api/execute/evaluate",
+                 lambda i: classification, requests=50),
+        Scenario("execute.visualize.scatter", "POST", "/api/execute/visualize", lambda i: "/api/execute/visualize",
+                 lambda i: {"type": "scatter", "x": regression["y_true"][:5000], "y": regression["y_pred"][:5000]}),
+        Scenario("execute.visualize.confusion_matrix", "POST", "/api/execute/visualize", lambda i: "/api/execute/visualize",
+                 lambda i: {"type": "confusion_matrix", "matrix": [[50, 3, 2], [4, 45, 6], [1, 2, 60]]}),
+
+        # learning_path router
+        Scenario("learning_path.progress.save", "POST", f"{lp}/progress/save",
+                 lambda i: f"{lp}/progress/save", progress_payload),
+        Scenario("learning_path.progress.load", "GET", f"{lp}/progress/load/{{student_id}}",
+                 lambda i: f"{lp}/progress/load/{student_id(i)}"),
+        Scenario("learning_path.progress.sync", "POST", f"{lp}/progress/sync", lambda i: f"{lp}/progress/sync",
+                 lambda i: {
+                     "studentId": student_id(i),
+                     "updates": {"knn": {"status": "in_progress", "completionPercentage": i % 100}},
+                     "timestamp": f"2100-01-01T00:00:{i % 60:02d}.{i % 1_000_000:06d}"
+                 }),
+        Scenario("learning_path.achievements.get", "GET", f"{lp}/achievements/{{student_id}}",
+                 lambda i: f"{lp}/achievements/{student_id(i)}"),
+        Scenario("learning_path.achievements.award", "POST", f"{lp}/achievements/award",
+                 lambda i: f"{lp}/achievements/award",
+                 lambda i: {"studentId": student_id(i), "achievementId": f"bench_{i}"}),
+        Scenario("learning_path.achievements.award_batch", "POST", f"{lp}/achievements/award/batch",
+                 lambda i: f"{lp}/achievements/award/batch",
+                 lambda i: {"awards": [{"studentId": s, "achievementId": f"bench_batch_{i}"} for s in students]},
+                 requests=50),
+        Scenario("learning_path.certificates.get", "GET", f"{lp}/certificates/{{student_id}}",
+                 lambda i: f"{lp}/certificates/{student_id(i)}"),
+        Scenario("learning_path.certificates.generate", "POST", f"{lp}/certificates/generate",
+                 lambda i: f"{lp}/certificates/generate",
+                 lambda i: {"studentId": student_id(i), "certificateType": "beginner", "studentName": f"Student {i % 7}"},
+                 requests=50),
+        Scenario("learning_path.challenges.get", "GET", f"{lp}/challenges/{{algorithm_id}}",
+                 lambda i: f"{lp}/challenges/{ALGORITHM_IDS[i % len(ALGORITHM_IDS)]}?studentId={student_id(i)}"),
+        Scenario("learning_path.challenges.submit", "POST", f"{lp}/challenges/submit",
+                 lambda i: f"{lp}/challenges/submit", submission_payload),
+        Scenario("learning_path.challenges.submit_batch", "POST", f"{lp}/challenges/submit/batch",
+                 lambda i: f"{lp}/challenges/submit/batch",
+                 lambda i: {"submissions": [submission_payload(i * STUDENT_COUNT + j) for j in range(STUDENT_COUNT)]},
+                 requests=50),
+        Scenario("learning_path.challenges.history", "GET", f"{lp}/challenges/history/{{student_id}}/{{algorithm_id}}",
+                 lambda i: f"{lp}/challenges/history/{student_id(i)}/knn"),
+        Scenario("learning_path.students.batch", "POST", f"{lp}/students/batch",
+                 lambda i: f"{lp}/students/batch", lambda i: {"studentIds": students}, requests=50),
+        Scenario("learning_path.analytics", "GET", f"{lp}/analytics", lambda i: f"{lp}/analytics"),
+        Scenario("learning_path.recommendations", "GET", f"{lp}/recommendations/{{student_id}}",
+                 lambda i: f"{lp}/recommendations/{student_id(i)}"),
+        Scenario("learning_path.ws.progress", "WS", f"{lp}/ws/{{student_id}}",
+                 lambda i: f"{lp}/ws/{channel_student_id(i)}", channel_message),
+        Scenario("learning_path.bulk.export", "GET", f"{lp}/bulk/export",
+                 lambda i: f"{lp}/bulk/export", requests=20),
+        Scenario("learning_path.bulk.import", "POST", f"{lp}/bulk/import",
+                 lambda i: f"{lp}/bulk/import", import_payload, requests=20),
+
+        # certificates router
+        Scenario("certificates.download", "GET", "/api/certificates/download/{cert_id}",
+                 lambda i: f"/api/certificates/download/{{cert_id}}?format={'pdf' if i % 2 else 'png'}"),
+    ]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, bytes_received: int) -> Dict[str, Any]:
+    ordered = sorted(latencies)
+    count = len(ordered)
+    return {
+        "requests": count,
+        "errors": errors,
+        "throughput_rps": count / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(ordered, 50) * 1000,
+        "p95_ms": percentile(ordered, 95) * 1000,
+        "p99_ms": percentile(ordered, 99) * 1000,
+        "mean_ms": sum(ordered) / count * 1000 if count else 0.0,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0,
+        "avg_response_bytes": bytes_received / count if count else 0,
+    }
+
+
+def load_app():
+    """Import the FastAPI app with its own directory on sys.path"""
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+    from main import app
+    # httpx logs every request at INFO, which drowns the results
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    return app
+
+
+async def run_scenarios(scenario_names: List[str], requests: int, concurrency: int,
+                        warmup: int, seed_offset: int) -> Dict[str, Dict[str, Any]]:
+    import httpx
+
+    app = load_app()
+    scenarios = {s.name: s for s in build_scenarios()}
+    results: Dict[str, Dict[str, Any]] = {}
+
+    await app.router.startup()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None,
+                                     headers={"X-Admin-Token": os.environ["BULK_ADMIN_TOKEN"]}) as client:
+            # Measure the warmed-up app, as a load balancer would only route to it once ready
+            while (await client.get("/ready")).status_code != 200:
+                await asyncio.sleep(0.05)
+
+            # Seed students so reads hit real data
+            for i in range(STUDENT_COUNT):
+                await client.post("/api/learning-path/progress/save", json=progress_payload(i))
+            generated = await client.post(
+                "/api/learning-path/certificates/generate",
+                json={"studentId": student_id(0), "certificateType": "beginner", "studentName": "Bench Student"}
+            )
+            if generated.status_code != 200:
+                raise RuntimeError(f"Generating the bench certificate failed ({generated.status_code}): {generated.text}")
+            cert_id = generated.json()["certificate"]["certificateId"]
+
+            for name in scenario_names:
+                scenario = scenarios[name]
+                total = min(scenario.requests, requests) if scenario.requests else requests
+                semaphore = asyncio.Semaphore(concurrency)
+                latencies: List[float] = []
+                stats = {"errors": 0, "bytes": 0}
+
+                if scenario.method == "WS":
+                    # One socket per concurrency slot, each for a different student. Processes use
+                    # their own students, as their message timestamps overlap and would conflict
+                    sockets: asyncio.Queue = asyncio.Queue()
+                    for slot in range(concurrency):
+                        socket = ASGIWebSocket(app, scenario.path(seed_offset + slot))
+                        await socket.connect()
+                        await socket.receive()
+                        sockets.put_nowait(socket)
+
+                    async def one(i: int, record: bool):
+                        socket = await sockets.get()
+                        start = time.perf_counter()
+                        await socket.send(scenario.body(i))
+                        reply = await socket.receive()
+                        duration = time.perf_counter() - start
+                        sockets.put_nowait(socket)
+                        if record:
+                            latencies.append(duration)
+                            stats["bytes"] += len(json.dumps(reply))
+                            if not all(ack.get("success") for ack in reply.get("acks", [])):
+                                stats["errors"] += 1
+
+                    await asyncio.gather(*(one(seed_offset + i, False) for i in range(warmup)))
+                    started = time.perf_counter()
+                    await asyncio.gather(*(one(seed_offset + warmup + i, True) for i in range(total)))
+                    elapsed = time.perf_counter() - started
+                    while not sockets.empty():
+                        await sockets.get_nowait().close()
+                    results[name] = {
+                        "latencies": latencies,
+                        "errors": stats["errors"],
+                        "elapsed": elapsed,
+                        "bytes": stats["bytes"],
+                    }
+                    continue
+
+                async def one(i: int, record: bool):
+                    path = scenario.path(i).replace("{cert_id}", cert_id)
+                    body = scenario.body(i) if scenario.body else None
+                    async with semaphore:
+                        start = time.perf_counter()
+                        if isinstance(body, bytes):
+                            response = await client.request(scenario.method, path, content=body)
+                        else:
+                            response = await client.request(scenario.method, path, json=body)
+                        duration = time.perf_counter() - start
+                    if record:
+                        latencies.append(duration)
+                        stats["bytes"] += len(response.content)
+                        if response.status_code >= 400:
+                            stats["errors"] += 1
+
+                await asyncio.gather(*(one(seed_offset + i, False) for i in range(warmup)))
+                started = time.perf_counter()
+                await asyncio.gather(*(one(seed_offset + warmup + i, True) for i in range(total)))
+                elapsed = time.perf_counter() - started
+
+                results[name] = {
+                    "latencies": latencies,
+                    "errors": stats["errors"],
+                    "elapsed": elapsed,
+                    "bytes": stats["bytes"],
+                }
+    finally:
+        await app.router.shutdown()
+    return results
+
+
+def worker(args) -> Dict[str, Dict[str, Any]]:
+    scenario_names, requests, concurrency, warmup, index = args
+    return asyncio.run(run_scenarios(scenario_names, requests, concurrency, warmup, seed_offset=index * 1_000_000))
+
+
+def uncovered_routes(scenarios: List[Scenario]) -> List[str]:
+    """Routes registered on the app that no scenario exercises"""
+    from starlette.routing import WebSocketRoute
+
+    app = load_app()
+    covered = {(s.method, s.route) for s in scenarios}
+    missing = []
+    for route in app.routes:
+        methods = getattr(route, "methods", None) or ({"WS"} if isinstance(route, WebSocketRoute) else set())
+        if route.path.startswith(("/docs", "/redoc", "/openapi")):
+            continue
+        for method in methods - {"HEAD", "OPTIONS"}:
+            if (method, route.path) not in covered:
+                missing.append(f"{method} {route.path}")
+    return sorted(missing)
+
+
+def compare_to_baseline(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Any],
+                        threshold: float) -> List[str]:
+    """Scenarios whose p95 latency or throughput moved past the threshold"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        if previous["p95_ms"] and current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(
+                f"{name}: p95 {current['p95_ms']:.2f}ms vs baseline {previous['p95_ms']:.2f}ms"
+            )
+        if previous["throughput_rps"] and current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {current['throughput_rps']:.1f}/s vs baseline {previous['throughput_rps']:.1f}/s"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every API route in-process")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per scenario (per process)")
+    parser.add_argument("--concurrency", type=int, default=10, help="Concurrent requests per process")
+    parser.add_argument("--processes", type=int, default=1, help="Load generator processes")
+    parser.add_argument("--warmup", type=int, default=5, help="Unrecorded requests before each scenario")
+    parser.add_argument("--only", help="Regex selecting scenario names")
+    parser.add_argument("--output", help="Write results as JSON to this path")
+    parser.add_argument("--baseline", help="Compare against results saved by a previous run")
+    parser.add_argument("--save-baseline", help="Also write results to this baseline path")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed relative regression (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    # Keep benchmark writes (database, legacy progress files, rendered certificates) out of app/data
+    data_dir = tempfile.mkdtemp(prefix="bench_")
+    os.environ.setdefault("LEARNING_PATH_DATA_DIR", data_dir)
+    os.environ.setdefault("LEARNING_PATH_DB", os.path.join(data_dir, "learning_path.db"))
+    os.environ.setdefault("CERTIFICATE_CACHE_DIR", os.path.join(data_dir, "certificates"))
+    # The bulk routes are closed without a token
+    os.environ.setdefault("BULK_ADMIN_TOKEN", "bench")
+
+    scenarios = build_scenarios()
+    names = [s.name for s in scenarios if not args.only or re.search(args.only, s.name)]
+    if not names:
+        print(f"No scenarios match '{args.only}'")
+        return 2
+
+    missing = uncovered_routes(scenarios)
+    if missing:
+        print("⚠️  Routes without a benchmark scenario:")
+        for route in missing:
+            print(f"  - {route}")
+
+    jobs = [(names, args.requests, args.concurrency, args.warmup, i) for i in range(args.processes)]
+    if args.processes == 1:
+        per_process = [worker(jobs[0])]
+    else:
+        # Not multiprocessing.Pool: its daemonic workers cannot start the app's certificate render pool
+        with ProcessPoolExecutor(args.processes, mp_context=multiprocessing.get_context("spawn")) as pool:
+            per_process = list(pool.map(worker, jobs))
+
+    results = {}
+    for name in names:
+        latencies = [lat for run in per_process for lat in run[name]["latencies"]]
+        errors = sum(run[name]["errors"] for run in per_process)
+        received = sum(run[name]["bytes"] for run in per_process)
+        # Processes run side by side, so wall time is the slowest one
+        elapsed = max(run[name]["elapsed"] for run in per_process)
+        results[name] = summarize(latencies, errors, elapsed, received)
+
+    print(f"\n{'scenario':<42} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    print("-" * 90)
+    for name, r in results.items():
+        print(f"{name:<42} {r['throughput_rps']:>9.1f} {r['p50_ms']:>9.2f} "
+              f"{r['p95_ms']:>9.2f} {r['p99_ms']:>9.2f} {r['errors']:>7}")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "processes": args.processes,
+        },
+        "results": results,
+    }
+    for path in filter(None, [args.output, args.save_baseline]):
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {path}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n❌ {len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print(f"\n✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
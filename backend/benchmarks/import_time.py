@@ -0,0 +1,129 @@
+"""
+Import Time Report
+Measures how long importing the FastAPI app takes (python -X importtime),
+lists the slowest modules and fails when the total exceeds a budget
+
+Usage (from backend/):
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --budget-ms 1500 --runs 5 --top 25
+    python benchmarks/import_time.py --output import_time.json
+"""
+
+from pathlib import Path
+from typing import Any, Dict, List
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+# Default budget for importing main, in milliseconds
+DEFAULT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "2000"))
+
+# Prefixes of the app's own modules
+APP_MODULES = ("main", "routes", "services")
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(module: str) -> List[Dict[str, Any]]:
+    """Import a module in a fresh interpreter and return -X importtime entries in import order"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"Importing {module} failed:\n{result.stderr}")
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append({
+                "module": name,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    return entries
+
+
+def report(entries: List[Dict[str, Any]], module: str, top: int) -> Dict[str, Any]:
+    # Nested imports are printed before the module that triggered them, so the
+    # app's share is the run of entries since the previous top-level import
+    end = next((i for i, e in enumerate(entries) if e["module"] == module and e["depth"] == 0), None)
+    if end is None:
+        sys.exit(f"No import time recorded for {module}")
+    start = max((i for i, e in enumerate(entries[:end]) if e["depth"] == 0), default=-1) + 1
+    entries = entries[start:end + 1]
+    total = entries[-1]["cumulative_ms"]
+    # Top-level packages pulled in (directly or not) by the app, by their own cumulative time
+    packages: Dict[str, float] = {}
+    for entry in entries:
+        package = entry["module"].split(".")[0]
+        if entry["module"] == package:
+            packages[package] = max(packages.get(package, 0.0), entry["cumulative_ms"])
+    packages.pop(module, None)
+    return {
+        "module": module,
+        "total_ms": total,
+        "app_modules": sorted(
+            [e for e in entries if e["module"].split(".")[0] in APP_MODULES and e["module"] != module],
+            key=lambda e: -e["cumulative_ms"]
+        )[:top],
+        "packages": sorted(
+            [{"package": name, "cumulative_ms": ms} for name, ms in packages.items()],
+            key=lambda p: -p["cumulative_ms"]
+        )[:top],
+        "slowest_self": sorted(entries, key=lambda e: -e["self_ms"])[:top],
+    }
+
+
+def print_report(result: Dict[str, Any], budget_ms: float):
+    print(f"\nimport {result['module']}: {result['total_ms']:.1f} ms (budget {budget_ms:.0f} ms)\n")
+    print(f"{'app module':<40} {'cumulative ms':>14} {'self ms':>10}")
+    print("-" * 66)
+    for entry in result["app_modules"]:
+        print(f"{entry['module']:<40} {entry['cumulative_ms']:>14.1f} {entry['self_ms']:>10.1f}")
+    print(f"\n{'package':<40} {'cumulative ms':>14}")
+    print("-" * 55)
+    for entry in result["packages"]:
+        print(f"{entry['package']:<40} {entry['cumulative_ms']:>14.1f}")
+    print(f"\n{'module (slowest self time)':<40} {'self ms':>14}")
+    print("-" * 55)
+    for entry in result["slowest_self"]:
+        print(f"{entry['module']:<40} {entry['self_ms']:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report app import time and check it against a budget")
+    parser.add_argument("--module", default="main", help="Module to import from app/")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Fail when the import takes longer (env IMPORT_BUDGET_MS)")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters to measure; the fastest run is kept")
+    parser.add_argument("--top", type=int, default=15, help="Rows per table")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    # The fastest run is the least disturbed by disk cache misses and other load
+    runs = [report(measure(args.module), args.module, args.top) for _ in range(max(args.runs, 1))]
+    result = min(runs, key=lambda r: r["total_ms"])
+    result["budget_ms"] = args.budget_ms
+    result["runs_ms"] = [r["total_ms"] for r in runs]
+    print_report(result, args.budget_ms)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if result["total_ms"] > args.budget_ms:
+        print(f"\n❌ Import time {result['total_ms']:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        sys.exit(1)
+    print("\n✅ Import time within budget")
+
+
+if __name__ == "__main__":
+    main()
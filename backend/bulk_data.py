@@ -0,0 +1,174 @@
+"""
+Bulk Data CLI
+Exports learning path records to an NDJSON file and imports them back,
+either straight against the SQLite store or through a running API
+
+Usage (from backend/):
+    python bulk_data.py export --output backup.ndjson
+    python bulk_data.py export --output backup.ndjson --resume
+    python bulk_data.py export --types progress,achievement --url http://localhost:8000
+    python bulk_data.py import backup.ndjson --import-id restore-1
+    python bulk_data.py import backup.ndjson --import-id restore-1 --url http://localhost:8000
+"""
+
+from pathlib import Path
+from typing import Iterator, Optional, Tuple
+import argparse
+import json
+import os
+import sys
+
+APP_DIR = Path(__file__).resolve().parent / "app"
+
+# Bytes read from the import file at a time
+CHUNK_SIZE = 1024 * 1024
+
+# Marks the start of a cursor line in an export
+CURSOR_PREFIX = b'{"type": "cursor"'
+
+
+def load_services():
+    """Import the store and bulk services with the app directory on sys.path"""
+    if str(APP_DIR) not in sys.path:
+        sys.path.insert(0, str(APP_DIR))
+    from services import bulk, store
+    store.store.initialize()
+    return bulk, store
+
+
+def last_cursor(path: str) -> Tuple[int, Optional[str]]:
+    """
+    Offset just past the last complete cursor line of a partial export, and its cursor
+    The file is read backwards, so only the tail after the last cursor is scanned
+    """
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        tail = b""
+        while position > 0:
+            step = min(CHUNK_SIZE, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+            search = len(tail)
+            while True:
+                start = tail.rfind(b"\n" + CURSOR_PREFIX, 0, search)
+                if start < 0:
+                    break
+                end = tail.find(b"\n", start + 1)
+                if end < 0:
+                    # Cut off mid-line
+                    search = start
+                    continue
+                return position + end + 1, json.loads(tail[start + 1:end])["cursor"]
+    return 0, None
+
+
+def skip_header(chunks: Iterator[bytes]) -> Iterator[bytes]:
+    """Drop the first line of a stream (the header of a resumed export)"""
+    pending = b""
+    for chunk in chunks:
+        pending += chunk
+        if b"\n" in pending:
+            yield pending.split(b"\n", 1)[1]
+            break
+    yield from chunks
+
+
+def read_chunks(path: str) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
+
+
+def admin_headers(token: Optional[str]):
+    return {"X-Admin-Token": token} if token else {}
+
+
+def export_command(args):
+    after = args.after
+    mode = "wb"
+    if args.resume and os.path.exists(args.output):
+        offset, after = last_cursor(args.output)
+        if after is None:
+            print("No cursor in the partial export, starting over", file=sys.stderr)
+        else:
+            # Drop the incomplete page after the last cursor and continue from it
+            with open(args.output, "r+b") as f:
+                f.truncate(offset)
+            mode = "ab"
+            print(f"Resuming export after {after}", file=sys.stderr)
+    types = [kind for kind in args.types.split(",") if kind] if args.types else None
+
+    with open(args.output, mode) as out:
+        if args.url:
+            import httpx
+            params = {"after": after} if after else {}
+            if types:
+                params["types"] = ",".join(types)
+            with httpx.stream("GET", f"{args.url.rstrip('/')}/api/learning-path/bulk/export", params=params,
+                              headers=admin_headers(args.token), timeout=None) as response:
+                if response.status_code != 200:
+                    response.read()
+                    sys.exit(f"Export failed ({response.status_code}): {response.text}")
+                chunks = response.iter_bytes()
+                for chunk in skip_header(chunks) if mode == "ab" else chunks:
+                    out.write(chunk)
+        else:
+            _, store = load_services()
+            chunks = store.store.export_ndjson(types, after)
+            for chunk in skip_header(chunks) if mode == "ab" else chunks:
+                out.write(chunk)
+    print(f"Exported to {args.output}", file=sys.stderr)
+
+
+def import_command(args):
+    if args.url:
+        import httpx
+        params = {"batchSize": args.batch_size}
+        if args.import_id:
+            params["importId"] = args.import_id
+        response = httpx.post(f"{args.url.rstrip('/')}/api/learning-path/bulk/import", params=params,
+                              content=read_chunks(args.file), headers=admin_headers(args.token), timeout=None)
+        if response.status_code != 200:
+            sys.exit(f"Import failed ({response.status_code}): {response.text}")
+        summary = response.json()
+    else:
+        bulk, _ = load_services()
+        session = bulk.ImportSession(args.import_id, args.batch_size)
+        for chunk in read_chunks(args.file):
+            session.feed(chunk)
+        summary = session.finish()
+    print(json.dumps(summary, indent=2))
+
+
+def main():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--url", help="API base URL; without it the local SQLite store (LEARNING_PATH_DB) is used")
+    common.add_argument("--token", default=os.getenv("BULK_ADMIN_TOKEN"), help="X-Admin-Token for the API")
+
+    parser = argparse.ArgumentParser(description="Bulk export and import of learning path data (NDJSON)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = commands.add_parser("export", parents=[common], help="Write every record to an NDJSON file")
+    export_parser.add_argument("--output", "-o", required=True)
+    export_parser.add_argument("--types", help="Comma-separated record types (default: all)")
+    export_parser.add_argument("--after", help="Start after this export cursor")
+    export_parser.add_argument("--resume", action="store_true",
+                               help="Continue a partial export file from its last cursor")
+    export_parser.set_defaults(handler=export_command)
+
+    import_parser = commands.add_parser("import", parents=[common], help="Load an NDJSON export")
+    import_parser.add_argument("file")
+    import_parser.add_argument("--import-id", help="Resumable import; re-running skips lines already written")
+    import_parser.add_argument("--batch-size", type=int, default=500, help="Records per transaction")
+    import_parser.set_defaults(handler=import_command)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
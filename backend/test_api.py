@@ -5,9 +5,19 @@ Run this after starting the backend server
 
 import requests
 import json
+import os
+import time
+from websockets.sync.client import connect
 
 BASE_URL = "http://localhost:8000"
 
+# Must match the server's BULK_ADMIN_TOKEN; when unset, the bulk API is expected to be disabled
+BULK_ADMIN_TOKEN = os.getenv("BULK_ADMIN_TOKEN")
+
+# Must match the server's PROFILE_ADMIN_TOKEN and PROFILE_DIR; the profiling test is skipped without both
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN")
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+
 def test_health():
     """Test health check endpoint"""
     print("\n🔍 Testing health check...")
@@ -17,6 +27,17 @@ def test_health():
     assert response.status_code == 200
     print("✅ Health check passed!")
 
+def test_readiness():
+    """Test the readiness endpoint once startup warmup has finished"""
+    print("\n🔍 Testing readiness endpoint...")
+    response = requests.get(f"{BASE_URL}/ready")
+    print(f"Status: {response.status_code}")
+    data = response.json()
+    print(f"Readiness: {data['status']}, warmup: {data['elapsedSeconds']}s")
+    assert response.status_code == 200
+    assert data['status'] == 'ready'
+    print("✅ Readiness check passed!")
+
 def test_list_algorithms():
     """Test listing all algorithms"""
     print("\n🔍 Testing algorithm list...")
@@ -53,6 +74,31 @@ def test_get_section():
     assert response.status_code == 200
     print("✅ Get section passed!")
 
+def test_algorithm_projection():
+    """Test sparse fieldsets on the algorithm detail route"""
+    print("\n🔍 Testing algorithm projection (linear_regression)...")
+    response = requests.get(
+        f"{BASE_URL}/api/algorithms/linear_regression?fields=id,name&sections=mathematical_model"
+    )
+    print(f"Status: {response.status_code}")
+    data = response.json()
+    print(f"Keys: {list(data.keys())}, sections: {list(data['sections'].keys())}")
+    assert response.status_code == 200
+    assert set(data.keys()) == {'id', 'name', 'sections'}
+    assert list(data['sections'].keys()) == ['mathematical_model']
+    print("✅ Algorithm projection passed!")
+
+def test_equation_prerender():
+    """Test that equations are served with pre-rendered MathML"""
+    print("\n🔍 Testing pre-rendered equations (linear_regression)...")
+    response = requests.get(f"{BASE_URL}/api/algorithms/linear_regression?sections=mathematical_model")
+    print(f"Status: {response.status_code}")
+    equation = response.json()['sections']['mathematical_model']['equations'][0]
+    print(f"Equation fields: {list(equation.keys())}")
+    assert response.status_code == 200
+    assert equation['mathml'].startswith('<math')
+    print("✅ Equation pre-render passed!")
+
 def test_code_execution():
     """Test code execution"""
     print("\n🔍 Testing code execution...")
@@ -132,6 +178,321 @@ def test_categories():
     assert response.status_code == 200
     print("✅ Categories test passed!")
 
+def test_learning_path_batch():
+    """Test batch achievement awards and batch student loading"""
+    print("\n🔍 Testing learning path batch endpoints...")
+    response = requests.post(
+        f"{BASE_URL}/api/learning-path/achievements/award/batch",
+        json={
+            "awards": [
+                {"studentId": "batch_student_1", "achievementId": "first_steps"},
+                {"studentId": "batch_student_2", "achievementId": "first_steps"}
+            ]
+        }
+    )
+    print(f"Status: {response.status_code}")
+    data = response.json()
+    print(f"Results: {[r['success'] for r in data['results']]}")
+    assert response.status_code == 200
+    assert len(data['results']) == 2
+    
+    response = requests.post(
+        f"{BASE_URL}/api/learning-path/students/batch",
+        json={"studentIds": ["batch_student_1", "batch_student_2", "batch_student_3"]}
+    )
+    print(f"Status: {response.status_code}")
+    data = response.json()
+    print(f"Loaded {data['count']} students")
+    assert response.status_code == 200
+    assert data['count'] == 3
+    assert data['students'][0]['achievements']
+    print("✅ Learning path batch test passed!")
+
+def test_challenge_grading():
+    """Test serving and grading a challenge from the challenge bank"""
+    print("\n🔍 Testing challenge bank (knn)...")
+    response = requests.get(f"{BASE_URL}/api/learning-path/challenges/knn?studentId=test_student")
+    print(f"Status: {response.status_code}")
+    challenge = response.json()['challenge']
+    print(f"Question: {challenge['question']}")
+    assert response.status_code == 200
+    assert 'correctAnswer' not in challenge
+    
+    response = requests.post(
+        f"{BASE_URL}/api/learning-path/challenges/submit",
+        json={
+            "studentId": "test_student",
+            "challengeId": challenge['id'],
+            "algorithmId": "knn",
+            "selectedAnswer": "It becomes linear",
+            "timeSpent": 30
+        }
+    )
+    print(f"Status: {response.status_code}")
+    result = response.json()['result']
+    print(f"Correct: {result['correct']}, Score: {result['score']}")
+    assert response.status_code == 200
+    assert result['correct'] == False
+    print("✅ Challenge bank test passed!")
+
+def test_recommendations():
+    """Test server-side recommendations for a new student"""
+    print("\n🔍 Testing recommendations...")
+    response = requests.get(f"{BASE_URL}/api/learning-path/recommendations/test_new_student")
+    print(f"Status: {response.status_code}")
+    recommendations = response.json()['recommendations']
+    print(f"Next: {recommendations['next']['algorithmId']} - {recommendations['next']['reason']}")
+    assert response.status_code == 200
+    assert recommendations['recommendedDifficulty'] == 'Beginner'
+    assert 'decision_tree' in recommendations['locked']
+    print("✅ Recommendations test passed!")
+
+def metric_value(text, name, labels):
+    """Value of one sample in Prometheus text output, or 0 if it is not there yet"""
+    wanted = name + "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+    for line in text.splitlines():
+        if line.startswith(wanted + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+def test_metrics():
+    """Test the Prometheus endpoint and that requests are counted by route template"""
+    print("\n🔍 Testing metrics...")
+    labels = {"method": "GET", "route": "/api/learning-path/achievements/{student_id}", "status": "200"}
+    before = metric_value(requests.get(f"{BASE_URL}/metrics").text, "http_requests_total", labels)
+    assert requests.get(f"{BASE_URL}/api/learning-path/achievements/test_metrics_student").status_code == 200
+
+    response = requests.get(f"{BASE_URL}/metrics")
+    print(f"Status: {response.status_code}, Content-Type: {response.headers['Content-Type']}")
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+    after = metric_value(response.text, "http_requests_total", labels)
+    print(f"http_requests_total{{route=\"{labels['route']}\"}}: {before:.0f} -> {after:.0f}")
+    assert after == before + 1
+    # Counted under the template, never the raw path
+    assert 'test_metrics_student' not in response.text
+    print("✅ Metrics test passed!")
+
+def test_analytics():
+    """Test that a challenge submission shows up in the cohort analytics rollups"""
+    print("\n🔍 Testing learning path analytics...")
+    url = f"{BASE_URL}/api/learning-path/analytics"
+    before = requests.get(url, params={"algorithmId": "knn", "days": 7}).json()['analytics']
+    response = requests.post(
+        f"{BASE_URL}/api/learning-path/challenges/submit",
+        json={"studentId": "test_analytics", "challengeId": "knn_challenge", "algorithmId": "knn",
+              "selectedAnswer": "It becomes linear", "timeSpent": 45}
+    )
+    assert response.status_code == 200
+
+    response = requests.get(url, params={"algorithmId": "knn", "days": 7})
+    print(f"Status: {response.status_code}")
+    assert response.status_code == 200
+    analytics = response.json()['analytics']
+    assert set(analytics) == {'algorithms', 'challenges', 'achievements', 'daily'}
+    algorithm = analytics['algorithms'][0]
+    print(f"knn: {algorithm['challengeAttempts']} attempts, accuracy {algorithm['challengeAccuracy']:.2f}")
+    assert algorithm['algorithmId'] == 'knn'
+    assert algorithm['challengeAttempts'] == before['algorithms'][0]['challengeAttempts'] + 1
+    challenge = next(c for c in analytics['challenges'] if c['challengeId'] == 'knn_challenge')
+    assert challenge['attempts'] >= 1
+    assert sum(challenge['timeSpentHistogram'].values()) == challenge['attempts']
+    assert analytics['daily'][-1]['challengeSubmissions'] >= 1
+    assert len(analytics['daily']) <= 7
+
+    for days in (0, 100000):
+        response = requests.get(url, params={"days": days})
+        print(f"days={days}: {response.status_code}")
+        assert response.status_code == 400
+    print("✅ Analytics test passed!")
+
+def receive_until(socket, done, timeout=5):
+    """Collect channel messages until done(messages) holds"""
+    messages = []
+    deadline = time.time() + timeout
+    while not done(messages):
+        messages.append(json.loads(socket.recv(timeout=max(deadline - time.time(), 0.01))))
+    return messages
+
+def test_learning_path_channel():
+    """Test batched acks on the WebSocket channel and pushes between a student's tabs"""
+    print("\n🔍 Testing learning path channel...")
+    student_id = f"test_channel_{time.time_ns()}"
+    url = BASE_URL.replace("http", "ws", 1) + f"/api/learning-path/ws/{student_id}"
+    with connect(url) as tab, connect(url) as other_tab:
+        assert json.loads(tab.recv(timeout=5))['type'] == 'hello'
+        assert json.loads(other_tab.recv(timeout=5))['type'] == 'hello'
+
+        # Sent back to back, so they are answered by one or a few batched acks
+        tab.send(json.dumps({"type": "progress", "seq": 1, "updates": {"knn": {"status": "in_progress"}}}))
+        tab.send(json.dumps({"type": "ping", "seq": 2}))
+        tab.send("not json")
+        tab.send(json.dumps({"type": "achievement", "seq": 3, "achievementId": "first_steps"}))
+        tab.send(json.dumps({"type": "unknown", "seq": 4}))
+        replies = receive_until(tab, lambda messages: sum(len(m['acks']) for m in messages) >= 5)
+        assert all(reply['type'] == 'ack' for reply in replies)
+        acks = [ack for reply in replies for ack in reply['acks']]
+        print(f"{len(acks)} acks in {len(replies)} replies")
+        by_seq = {ack['seq']: ack for ack in acks}
+        assert by_seq[1]['success'] and by_seq[2]['success'] and by_seq[3]['success']
+        assert not by_seq[None]['success'] and not by_seq[4]['success']
+
+        # The other tab is pushed what this one did; this one is not echoed
+        pushes = receive_until(other_tab, lambda messages: {m['type'] for m in messages} >= {'progress', 'achievement'})
+        print(f"Relayed to the other tab: {[m['type'] for m in pushes]}")
+        progress = next(m for m in pushes if m['type'] == 'progress')
+        assert progress['data']['algorithmProgress']['knn']['status'] == 'in_progress'
+        achievement = next(m for m in pushes if m['type'] == 'achievement')
+        assert achievement['achievement']['achievementId'] == 'first_steps'
+
+        # Changes made over HTTP are pushed to every tab
+        response = requests.post(
+            f"{BASE_URL}/api/learning-path/achievements/award",
+            json={"studentId": student_id, "achievementId": "quick_learner"}
+        )
+        assert response.json()['success']
+        for socket in (tab, other_tab):
+            pushed = receive_until(socket, lambda messages: messages and messages[-1]['type'] == 'achievement')
+            assert pushed[-1]['achievement']['achievementId'] == 'quick_learner'
+    print("✅ Learning path channel test passed!")
+
+def test_bulk_access():
+    """Test that the bulk API rejects requests without the admin token, and is closed when none is set"""
+    print("\n🔍 Testing bulk access control...")
+    export = requests.get(f"{BASE_URL}/api/learning-path/bulk/export")
+    wrong = requests.get(f"{BASE_URL}/api/learning-path/bulk/export", headers={"X-Admin-Token": "wrong"})
+    imported = requests.post(f"{BASE_URL}/api/learning-path/bulk/import", data=b"")
+    print(f"No token: {export.status_code}, wrong token: {wrong.status_code}, import: {imported.status_code}")
+    expected = 403 if BULK_ADMIN_TOKEN else 503
+    assert export.status_code == expected
+    assert wrong.status_code == expected
+    assert imported.status_code == expected
+    print("✅ Bulk access test passed!")
+
+def test_bulk_export_import():
+    """Test the NDJSON export streamed back through a resumable import"""
+    print("\n🔍 Testing bulk export and import...")
+    if not BULK_ADMIN_TOKEN:
+        print("Skipped: set BULK_ADMIN_TOKEN for both the server and this script")
+        return
+    headers = {"X-Admin-Token": BULK_ADMIN_TOKEN}
+    response = requests.get(f"{BASE_URL}/api/learning-path/bulk/export?types=achievement", headers=headers)
+    print(f"Status: {response.status_code}")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert response.status_code == 200
+    assert lines[0]['type'] == 'header'
+    response = requests.post(
+        f"{BASE_URL}/api/learning-path/bulk/import?importId=test_api_roundtrip",
+        data=response.content, headers=headers
+    )
+    summary = response.json()
+    print(f"Imported: {summary['imported']}, lines: {summary['lines']}, resumed from: {summary['resumedFrom']}")
+    assert response.status_code == 200
+    assert summary['errorCount'] == 0
+    print("✅ Bulk export/import test passed!")
+
+def generate_certificate(student_name, completion_date="2024-06-01T12:00:00"):
+    response = requests.post(
+        f"{BASE_URL}/api/learning-path/certificates/generate",
+        # Certificate IDs include the student and the second they were issued, so use a fresh student each time
+        json={"studentId": f"test_cert_{time.time_ns()}", "certificateType": "beginner",
+              "studentName": student_name, "completionDate": completion_date}
+    )
+    assert response.status_code == 200
+    return response.json()['certificate']['certificateId']
+
+def download_certificate(cert_id, headers=None, timeout=30):
+    """Download a certificate, polling while it renders; returns (first status, final response)"""
+    url = f"{BASE_URL}/api/certificates/download/{cert_id}?format=pdf"
+    response = requests.get(url, headers=headers)
+    first_status = response.status_code
+    deadline = time.time() + timeout
+    while response.status_code == 202 and time.time() < deadline:
+        time.sleep(float(response.headers.get("Retry-After", "1")) / 4)
+        response = requests.get(url, headers=headers)
+    return first_status, response
+
+def test_sync_handler_profile():
+    """Test that a profiled sync (threadpool) route's own frames appear in its profile"""
+    print("\n🔍 Testing profiling of a sync handler...")
+    if not (PROFILE_ADMIN_TOKEN and PROFILE_DIR):
+        print("Skipped: set PROFILE_ADMIN_TOKEN and PROFILE_DIR for both the server and this script")
+        return
+    payload = {"studentIds": [f"test_profile_{i}" for i in range(500)]}
+    frame = "learning_path.py:load_students_batch"
+
+    def profiles():
+        if not os.path.isdir(PROFILE_DIR):
+            return set()
+        return {name for name in os.listdir(PROFILE_DIR) if name.endswith(".folded") and "students_batch" in name}
+
+    found = False
+    # A fast request can fall between two samples, so allow a few tries
+    for attempt in range(10):
+        before = profiles()
+        response = requests.post(f"{BASE_URL}/api/learning-path/students/batch", json=payload,
+                                 headers={"X-Profile": PROFILE_ADMIN_TOKEN})
+        assert response.status_code == 200
+        # The profile is written after the response is sent
+        for _ in range(50):
+            new = profiles() - before
+            if new:
+                break
+            time.sleep(0.1)
+        assert new, "no profile was written"
+        with open(os.path.join(PROFILE_DIR, new.pop())) as f:
+            if frame in f.read():
+                found = True
+                break
+    print(f"Found {frame} after {attempt + 1} request(s): {found}")
+    assert found
+    print("✅ Sync handler profiling test passed!")
+
+def test_certificate_downloads():
+    """Test rendered certificate downloads: pending, caching, ETags and ranges"""
+    print("\n🔍 Testing certificate downloads...")
+    # A name never rendered before, so the first download finds it still rendering
+    name = f"Test Student {time.time()}"
+    first_status, response = download_certificate(generate_certificate(name))
+    print(f"First download: {first_status}, then {response.status_code}")
+    assert first_status == 202
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'application/pdf'
+    etag = response.headers['ETag']
+    body = response.content
+
+    # Cache hit: the same certificate is served from disk with the same ETag
+    cert_id = generate_certificate(name)
+    first_status, response = download_certificate(cert_id)
+    print(f"Re-issued certificate: {first_status}, ETag {response.headers['ETag'][:12]}...")
+    assert first_status == 200
+    assert response.headers['ETag'] == etag
+    assert response.content == body
+
+    # Content-addressed keys: the time of day does not matter, the name does
+    _, same_day = download_certificate(generate_certificate(name, "2024-06-01T18:30:00"))
+    _, other_name = download_certificate(generate_certificate(name + " Jr"))
+    assert same_day.headers['ETag'] == etag
+    assert other_name.headers['ETag'] != etag
+
+    # ETag revalidation
+    _, response = download_certificate(cert_id, headers={"If-None-Match": etag})
+    print(f"If-None-Match: {response.status_code}")
+    assert response.status_code == 304
+
+    # Range requests
+    _, response = download_certificate(cert_id, headers={"Range": "bytes=0-99"})
+    print(f"Range 0-99: {response.status_code} {response.headers['Content-Range']}")
+    assert response.status_code == 206
+    assert response.content == body[:100]
+    assert response.headers['Content-Range'] == f"bytes 0-99/{len(body)}"
+    _, response = download_certificate(cert_id, headers={"Range": "bytes=-50"})
+    assert response.status_code == 206
+    assert response.content == body[-50:]
+    _, response = download_certificate(cert_id, headers={"Range": f"bytes={len(body)}-"})
+    assert response.status_code == 416
+    print("✅ Certificate download test passed!")
+
 def run_all_tests():
     """Run all tests"""
     print("=" * 60)
@@ -140,13 +501,26 @@ def run_all_tests():
     
     try:
         test_health()
+        test_readiness()
+        test_metrics()
         test_list_algorithms()
         test_get_algorithm()
         test_get_section()
+        test_algorithm_projection()
+        test_equation_prerender()
         test_code_execution()
         test_regression_evaluation()
         test_classification_evaluation()
         test_categories()
+        test_learning_path_batch()
+        test_challenge_grading()
+        test_recommendations()
+        test_analytics()
+        test_learning_path_channel()
+        test_bulk_access()
+        test_bulk_export_import()
+        test_certificate_downloads()
+        test_sync_handler_profile()
         
         print("\n" + "=" * 60)
         print("✅ ALL TESTS PASSED!")